@@ -6,7 +6,9 @@ Each new session creates a new log file in data/logs/ directory.
 """
 
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -37,6 +39,8 @@ class AuditLogger:
         self.session_id: str = ""
         self.log_file_path: Optional[Path] = None
         self.file_handler: Optional[logging.FileHandler] = None
+        self.queue_handler: Optional[logging.handlers.QueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
         self.logger: Optional[logging.Logger] = None
         AuditLogger._initialized = True
 
@@ -64,7 +68,8 @@ class AuditLogger:
         self.logger = logging.getLogger("audit")
         self.logger.setLevel(logging.DEBUG)
 
-        # Remove any existing handlers to avoid duplicates
+        # Stop a previous session's writer and remove any existing handlers
+        self._stop_listener()
         self.logger.handlers.clear()
 
         # Create file handler for this session
@@ -82,8 +87,15 @@ class AuditLogger:
         )
         self.file_handler.setFormatter(formatter)
 
-        # Add handler to audit logger
-        self.logger.addHandler(self.file_handler)
+        # Callers only enqueue records (timestamped when created); a single
+        # listener thread writes them to the file in order
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(log_queue)
+        self.logger.addHandler(self.queue_handler)
+        self.listener = logging.handlers.QueueListener(
+            log_queue, self.file_handler, respect_handler_level=True
+        )
+        self.listener.start()
 
         # Write session header
         self._write_session_header()
@@ -198,10 +210,19 @@ class AuditLogger:
             self.logger.info(f"Session ended: {datetime.now().isoformat()}")
             self.logger.info("=" * 80)
 
-            # Close file handler
+            # Drain queued records, then close the file handler
+            self._stop_listener()
             if self.file_handler:
                 self.file_handler.close()
-                self.logger.removeHandler(self.file_handler)
+
+    def _stop_listener(self):
+        """Flush and stop the queue listener, detaching its queue handler."""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+        if self.queue_handler and self.logger:
+            self.logger.removeHandler(self.queue_handler)
+            self.queue_handler = None
 
     def get_log_file_path(self) -> Optional[Path]:
         """Get the current log file path."""
@@ -4,6 +4,7 @@ This module provides functionality for persisting and loading conversation
 history to/from disk, enabling session continuity across application restarts.
 """
 
+import heapq
 import json
 import logging
 import os
@@ -338,8 +339,11 @@ class ConversationStore:
 
         return self.current_session.workflow_state
 
-    def list_sessions(self) -> List[Dict[str, Any]]:
-        """List all stored sessions.
+    def list_sessions(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List stored sessions, most recently updated first.
+
+        Args:
+            limit: Maximum number of sessions to return (all if None)
 
         Returns:
             List of session metadata dictionaries
@@ -354,6 +358,8 @@ class ConversationStore:
                 index = json.load(f)
 
             sessions = index.get("sessions", [])
+            if limit is not None:
+                return heapq.nlargest(limit, sessions, key=lambda x: x.get("updated_at", ""))
             sessions.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
             return sessions
 
@@ -15,6 +15,7 @@ from tools.deep_tools.planning_tool import (
     get_next_task,
     TaskStep,
     TaskStatus,
+    TaskGraph,
 )
 from agent.orchestrator.models import OrchestratorState
 
@@ -29,6 +30,7 @@ class PlanningContext:
     Attributes:
         task_description: Original task description
         tasks: List of planned tasks
+        graph: Dependency graph tracking which tasks are ready
         current_task_index: Index of currently executing task
         started_at: When planning started
         completed_tasks: Count of completed tasks
@@ -42,6 +44,7 @@ class PlanningContext:
         """
         self.task_description = task_description
         self.tasks: List[TaskStep] = []
+        self.graph: Optional[TaskGraph] = None
         self.current_task_index: int = 0
         self.started_at: datetime = datetime.now()
         self.completed_tasks: int = 0
@@ -56,6 +59,7 @@ class PlanningContext:
             List of planned tasks
         """
         self.tasks = write_todos(self.task_description, context)
+        self.graph = TaskGraph.from_tasks(self.tasks)
         logger.info(f"Created plan with {len(self.tasks)} tasks")
         return self.tasks
 
@@ -65,7 +69,16 @@ class PlanningContext:
         Returns:
             Current task or None if all tasks complete
         """
-        return get_next_task(self.tasks)
+        if self.graph is None:
+            return get_next_task(self.tasks)
+        return self.graph.next_task()
+
+    def _set_status(self, step_number: int, status: TaskStatus) -> None:
+        """Update a task status through the dependency graph when available."""
+        if self.graph is None:
+            self.tasks = update_task_status(self.tasks, step_number, status)
+        else:
+            self.graph.set_status(step_number, status)
 
     def mark_task_complete(self, step_number: int) -> None:
         """Mark a task as complete.
@@ -73,7 +86,7 @@ class PlanningContext:
         Args:
             step_number: Step number to mark complete
         """
-        self.tasks = update_task_status(self.tasks, step_number, TaskStatus.COMPLETED)
+        self._set_status(step_number, TaskStatus.COMPLETED)
         self.completed_tasks += 1
         logger.info(f"Task {step_number} completed ({self.completed_tasks}/{len(self.tasks)})")
 
@@ -83,7 +96,7 @@ class PlanningContext:
         Args:
             step_number: Step number to mark in progress
         """
-        self.tasks = update_task_status(self.tasks, step_number, TaskStatus.IN_PROGRESS)
+        self._set_status(step_number, TaskStatus.IN_PROGRESS)
 
     def mark_task_failed(self, step_number: int) -> None:
         """Mark a task as failed.
@@ -91,7 +104,7 @@ class PlanningContext:
         Args:
             step_number: Step number to mark failed
         """
-        self.tasks = update_task_status(self.tasks, step_number, TaskStatus.FAILED)
+        self._set_status(step_number, TaskStatus.FAILED)
 
     def get_progress(self) -> Dict[str, Any]:
         """Get planning progress.
@@ -0,0 +1,52 @@
+"""Tests for the supplier comparison tools."""
+
+import pytest
+
+from tools.custom_tools.comparison_tools import (
+    ComparisonCriteria,
+    QuotesBundle,
+    compare_by_criteria,
+    compare_suppliers,
+    compare_suppliers_batch,
+    find_best_value,
+)
+
+QUOTES = [
+    {"supplier_id": "SUP001", "supplier_name": "Acme", "unit_price": 2.0, "lead_time_days": 5, "rating": 4.5},
+    {"supplier_id": "SUP002", "supplier_name": "Beta", "unit_price": 1.5, "lead_time_days": 9, "rating": 3.9},
+]
+
+
+def test_bundle_matches_list_input():
+    bundle = QuotesBundle.from_quotes(QUOTES)
+
+    assert compare_by_criteria(bundle, ComparisonCriteria.PRICE, 10) == \
+        compare_by_criteria(QUOTES, ComparisonCriteria.PRICE, 10)
+    assert find_best_value(bundle, 10) is QUOTES[1]
+
+
+def test_bundle_requires_quotes_for_every_supplier():
+    columns = (("SUP001",), ("Acme",), (2.0,), (5,), (4.5,))
+
+    with pytest.raises(TypeError):
+        QuotesBundle(*columns)
+    with pytest.raises(ValueError):
+        QuotesBundle(*columns, quotes=())
+
+
+def test_scores_rounded_and_batch_matches_single():
+    quotes = QUOTES + [
+        {"supplier_id": "SUP003", "supplier_name": "Gamma", "unit_price": 1.7, "lead_time_days": 7, "rating": 4.1},
+    ]
+    product_quotes = {"P1": quotes, "P2": QUOTES[:1]}
+    quantities = {"P1": 3, "P2": 1}
+
+    batch = compare_suppliers_batch(product_quotes, quantities)
+    for result in batch:
+        single = compare_suppliers(result.product_id, result.product_name,
+                                   quantities[result.product_id], product_quotes[result.product_id])
+        assert result.model_dump() == single.model_dump()
+        for score in result.supplier_scores:
+            for value in (score.price_score, score.lead_time_score,
+                          score.quality_score, score.overall_score):
+                assert value == round(value, 2)
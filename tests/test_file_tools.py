@@ -0,0 +1,92 @@
+"""Tests for the Deep Agents file tools."""
+
+import csv
+import math
+import shutil
+
+from tools.deep_tools.file_tools import (
+    _ARROW_CSV_MIN_BYTES,
+    read_file,
+    search_files,
+    write_file,
+)
+
+
+def _make_tree(root):
+    """Create a small directory tree with JSON files at two depths."""
+    (root / "sub").mkdir()
+    (root / "a.json").write_text("{}")
+    (root / "b.csv").write_text("x\n1\n")
+    (root / "sub" / "b.json").write_text("{}")
+
+
+def test_search_files_name_pattern(tmp_path):
+    _make_tree(tmp_path)
+
+    assert search_files(str(tmp_path), "*.json") == [
+        str(tmp_path / "a.json"),
+        str(tmp_path / "sub" / "b.json"),
+    ]
+    assert search_files(str(tmp_path), "*.json", recursive=False) == [
+        str(tmp_path / "a.json"),
+    ]
+
+
+def test_search_files_pattern_with_directory_part(tmp_path):
+    _make_tree(tmp_path)
+
+    assert search_files(str(tmp_path), "sub/*.json") == [
+        str(tmp_path / "sub" / "b.json"),
+    ]
+
+
+def test_search_files_double_star_pattern(tmp_path):
+    _make_tree(tmp_path)
+
+    assert search_files(str(tmp_path), "**/*.json") == [
+        str(tmp_path / "a.json"),
+        str(tmp_path / "sub" / "b.json"),
+    ]
+
+
+def test_search_files_star_does_not_cross_separator(tmp_path):
+    _make_tree(tmp_path)
+
+    # fnmatch's "*" would match "sub/b.json"; glob's "*" stops at "/"
+    assert search_files(str(tmp_path), "s*b.json") == []
+    assert search_files(str(tmp_path), "*/b.json") == [
+        str(tmp_path / "sub" / "b.json"),
+    ]
+
+
+def test_json_round_trip_keeps_non_finite_floats(tmp_path):
+    path = str(tmp_path / "values.json")
+    write_file(path, {"nan": float("nan"), "items": [1.5, float("inf"), -float("inf")]})
+
+    data = read_file(path)
+
+    assert math.isnan(data["nan"])
+    assert data["items"] == [1.5, float("inf"), -float("inf")]
+
+
+def test_write_file_recreates_deleted_directory(tmp_path):
+    path = tmp_path / "out" / "notes.txt"
+    write_file(str(path), "first")
+    shutil.rmtree(tmp_path / "out")
+
+    write_file(str(path), "second")
+
+    assert path.read_text() == "second"
+
+
+def test_large_bom_csv_matches_dict_reader(tmp_path):
+    # Large enough to take the pyarrow path when pyarrow is installed
+    path = tmp_path / "bom.csv"
+    rows = "".join(f"{i},00{i},\"note {i}\"\n" for i in range(_ARROW_CSV_MIN_BYTES // 20))
+    path.write_text("\ufeffid,code,note\n" + rows, encoding="utf-8")
+    assert path.stat().st_size >= _ARROW_CSV_MIN_BYTES
+
+    with open(path, newline="", encoding="utf-8") as f:
+        expected = list(csv.DictReader(f))
+
+    assert read_file(str(path)) == expected
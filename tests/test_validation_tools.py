@@ -0,0 +1,174 @@
+"""Tests for the PO validation tools."""
+
+from tools.custom_tools.validation_tools import (
+    PO_VALIDATION_RULES,
+    ValidationCategory,
+    ValidationReport,
+    ValidationResult,
+    ValidationRule,
+    ValidationSeverity,
+    format_validation_report,
+    quick_validate,
+    validate_purchase_order,
+    validate_purchase_orders_batch,
+)
+
+
+def _report(message):
+    return ValidationReport(
+        entity_type="purchase_order",
+        entity_id="PO-1",
+        is_valid=False,
+        error_count=1,
+        results=[
+            ValidationResult(
+                rule_id="PO001",
+                rule_name="Maximum PO Amount",
+                category=ValidationCategory.BUSINESS_RULE,
+                severity=ValidationSeverity.ERROR,
+                passed=False,
+                message=message,
+            )
+        ],
+    )
+
+
+def test_format_validation_report_reflects_result_changes():
+    report = _report("first message")
+    assert "first message" in format_validation_report(report)
+
+    report.results[0].message = "second message"
+    assert "second message" in format_validation_report(report)
+
+    copy = report.model_copy(update={"results": [
+        report.results[0].model_copy(update={"message": "third message"})
+    ]})
+    assert "third message" in format_validation_report(copy)
+
+
+def test_po_rule_toggles_take_effect_without_reload():
+    po = {
+        "po_number": "PO-2",
+        "supplier_id": "SUP001",
+        "line_items": [{"product_id": "P1", "quantity": 1, "unit_price": 2.0, "line_total": 2.0}],
+        "total_amount": 2.0,
+    }
+    rule = PO_VALIDATION_RULES[0]
+    baseline = len(validate_purchase_order(po).results)
+
+    rule.enabled = False
+    try:
+        results = validate_purchase_order(po).results
+        assert len(results) == baseline - 1
+        assert rule.rule_id not in {r.rule_id for r in results}
+    finally:
+        rule.enabled = True
+
+    assert len(validate_purchase_order(po).results) == baseline
+
+
+def test_unhashable_supplier_id_fails_supplier_rule():
+    for supplier_id in ({"id": "SUP001"}, ["SUP001"]):
+        result = next(
+            r for r in validate_purchase_order({"po_number": "PO-3", "supplier_id": supplier_id}).results
+            if r.rule_id == "PO003"
+        )
+        assert not result.passed
+        assert "not on the approved suppliers list" in result.message
+
+
+def _tax_po(po_number, subtotal, tax_rate, tax_amount):
+    return {
+        "po_number": po_number,
+        "supplier_id": "SUP001",
+        "line_items": [{"product_id": "P1", "quantity": 1, "unit_price": subtotal, "line_total": subtotal}],
+        "subtotal": subtotal,
+        "tax_rate": tax_rate,
+        "tax_amount": tax_amount,
+        "total_amount": round(subtotal + tax_amount, 2),
+    }
+
+
+def test_batch_tax_check_matches_single_po_validation():
+    # Half-cent products where np.round and round() can disagree
+    pos = [
+        _tax_po("PO-T1", 12145.1, 0.05, 607.25),
+        _tax_po("PO-T2", 0.5, 0.05, 0.03),
+        _tax_po("PO-T3", 100.1, 0.075, 7.51),
+        _tax_po("PO-T4", 1001.3, 0.08, 80.1),
+        _tax_po("PO-T5", 250.0, 0.08, 25.0),
+    ]
+
+    batch = validate_purchase_orders_batch(pos)
+    for po, report in zip(pos, batch):
+        single = validate_purchase_order(po, use_cache=False)
+        batch_tax = next(r for r in report.results if r.rule_id == "PO007")
+        single_tax = next(r for r in single.results if r.rule_id == "PO007")
+        assert (batch_tax.passed, batch_tax.message) == (single_tax.passed, single_tax.message)
+        assert (report.is_valid, report.error_count) == (single.is_valid, single.error_count)
+
+
+def test_custom_rule_with_string_severity_is_counted():
+    po = {"po_number": "PO-4", "supplier_id": "SUP001"}
+    baseline = validate_purchase_order(po, use_cache=False)
+    rule = ValidationRule(
+        rule_id="CUSTOM1",
+        rule_name="Always Fails",
+        category="compliance",
+        severity="error",
+        validator=lambda data: (False, "custom failure", None),
+    )
+    PO_VALIDATION_RULES.append(rule)
+    try:
+        report = validate_purchase_order(po, use_cache=False)
+        assert report.error_count == baseline.error_count + 1
+        assert not report.is_valid
+        custom = next(r for r in report.results if r.rule_id == "CUSTOM1")
+        assert custom.severity is ValidationSeverity.ERROR
+    finally:
+        PO_VALIDATION_RULES.remove(rule)
+
+
+def test_quick_validate_reports_string_severity_messages():
+    po = {"po_number": "PO-5", "supplier_id": "SUP001"}
+    rules = [
+        ValidationRule(
+            rule_id="CUSTOM2",
+            rule_name="Custom Warning",
+            category="compliance",
+            severity="warning",
+            validator=lambda data: (False, "custom warning", None),
+        ),
+        ValidationRule(
+            rule_id="CUSTOM3",
+            rule_name="Custom Error",
+            category="compliance",
+            severity="error",
+            validator=lambda data: (False, "custom error", None),
+        ),
+    ]
+    PO_VALIDATION_RULES.extend(rules)
+    try:
+        is_valid, errors, warnings = quick_validate(po)
+        assert not is_valid
+        assert "custom error" in errors
+        assert "custom warning" in warnings
+    finally:
+        for rule in rules:
+            PO_VALIDATION_RULES.remove(rule)
+
+
+def test_report_cache_distinguishes_numeric_types():
+    def po(quantity):
+        return {
+            "po_number": "PO-6",
+            "supplier_id": "SUP001",
+            "line_items": [{"product_id": "P1", "quantity": quantity, "unit_price": 1.0, "line_total": 1.0}],
+        }
+
+    def quantity_message(report):
+        return next(r.message for r in report.results if r.rule_id == "PO005")
+
+    assert "quantity 20000 " in quantity_message(validate_purchase_order(po(20000)))
+    # 20000.0 == 20000, but the cached int report must not be reused
+    assert "quantity 20000.0 " in quantity_message(validate_purchase_order(po(20000.0)))
@@ -35,6 +35,7 @@ from tools.custom_tools.comparison_tools import (
     SupplierScore,
     ComparisonResult,
     ComparisonWeights,
+    QuotesBundle,
     # Functions
     normalize_score,
     calculate_price_score,
@@ -43,11 +44,13 @@ from tools.custom_tools.comparison_tools import (
     calculate_reliability_score,
     score_supplier,
     compare_suppliers,
+    compare_suppliers_batch,
     compare_by_criteria,
     find_best_value,
     generate_comparison_summary,
     # Constants
     WEIGHT_PROFILES,
+    RANK_EMOJI,
 )
 
 from tools.custom_tools.validation_tools import (
@@ -60,9 +63,11 @@ from tools.custom_tools.validation_tools import (
     ValidationRule,
     # Functions
     validate_purchase_order,
+    validate_purchase_orders_batch,
     validate_inventory_item,
     format_validation_report,
     quick_validate,
+    reload_po_rules,
     # Constants
     THRESHOLDS,
     APPROVED_SUPPLIERS,
@@ -91,6 +96,7 @@ __all__ = [
     "SupplierScore",
     "ComparisonResult",
     "ComparisonWeights",
+    "QuotesBundle",
     "normalize_score",
     "calculate_price_score",
     "calculate_lead_time_score",
@@ -98,10 +104,12 @@ __all__ = [
     "calculate_reliability_score",
     "score_supplier",
     "compare_suppliers",
+    "compare_suppliers_batch",
     "compare_by_criteria",
     "find_best_value",
     "generate_comparison_summary",
     "WEIGHT_PROFILES",
+    "RANK_EMOJI",
     # Validation Tools
     "ValidationSeverity",
     "ValidationCategory",
@@ -109,9 +117,11 @@ __all__ = [
     "ValidationReport",
     "ValidationRule",
     "validate_purchase_order",
+    "validate_purchase_orders_batch",
     "validate_inventory_item",
     "format_validation_report",
     "quick_validate",
+    "reload_po_rules",
     "THRESHOLDS",
     "APPROVED_SUPPLIERS",
     "PO_VALIDATION_RULES",
@@ -6,10 +6,12 @@ and overall value scoring.
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
 from pydantic import BaseModel, Field
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, astuple, field
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +62,69 @@ class ComparisonWeights:
         return abs(total - 1.0) < 0.001
 
 
+@dataclass(frozen=True)
+class QuotesBundle:
+    """Immutable supplier quotes with the scoring columns pre-extracted.
+
+    Build once with from_quotes() and reuse across comparisons (e.g. one
+    call per weight profile) to skip re-reading every quote dict. The
+    hash is computed once so bundles can key scoring caches.
+    """
+    supplier_ids: Tuple[str, ...]
+    supplier_names: Tuple[str, ...]
+    unit_prices: Tuple[float, ...]
+    lead_times: Tuple[int, ...]
+    ratings: Tuple[float, ...]
+    quotes: Tuple[Dict[str, Any], ...] = field(compare=False, repr=False)
+    _hash: int = field(default=0, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        if len(self.quotes) != len(self.supplier_ids):
+            raise ValueError(
+                f"QuotesBundle has {len(self.supplier_ids)} suppliers but "
+                f"{len(self.quotes)} quotes"
+            )
+        object.__setattr__(self, "_hash", hash((
+            self.supplier_ids, self.supplier_names, self.unit_prices,
+            self.lead_times, self.ratings
+        )))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __len__(self) -> int:
+        return len(self.supplier_ids)
+
+    @classmethod
+    def from_quotes(cls, supplier_quotes: List[Dict[str, Any]]) -> "QuotesBundle":
+        """Extract scoring columns from a list of supplier quote dicts.
+
+        Args:
+            supplier_quotes: List of supplier quote data
+
+        Returns:
+            QuotesBundle holding the quotes and their columns
+        """
+        return cls(
+            supplier_ids=tuple(q.get("supplier_id", "") for q in supplier_quotes),
+            supplier_names=tuple(q.get("supplier_name", "") for q in supplier_quotes),
+            unit_prices=tuple(q.get("unit_price", 0) for q in supplier_quotes),
+            lead_times=tuple(q.get("lead_time_days", 0) for q in supplier_quotes),
+            ratings=tuple(q.get("rating", 4.0) for q in supplier_quotes),
+            quotes=tuple(supplier_quotes),
+        )
+
+
+QuotesInput = Union[List[Dict[str, Any]], QuotesBundle]
+
+
+def _as_bundle(supplier_quotes: QuotesInput) -> QuotesBundle:
+    """Return supplier_quotes as a QuotesBundle, building one if needed."""
+    if isinstance(supplier_quotes, QuotesBundle):
+        return supplier_quotes
+    return QuotesBundle.from_quotes(supplier_quotes)
+
+
 # Default weights for different scenarios
 WEIGHT_PROFILES = {
     "balanced": ComparisonWeights(price=0.35, lead_time=0.25, quality=0.25, reliability=0.15),
@@ -69,6 +134,34 @@ WEIGHT_PROFILES = {
     "reliable": ComparisonWeights(price=0.25, lead_time=0.20, quality=0.25, reliability=0.30),
 }
 
+# Medal shown next to the top three suppliers in summaries
+RANK_EMOJI = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+# Score threshold and (score field, recommendation) pairs checked in order
+# for suppliers that are not ranked first
+RECOMMENDATION_THRESHOLD = 90
+_RECOMMENDATION_RULES = (
+    ("price_score", "Best price option"),
+    ("lead_time_score", "Fastest delivery"),
+    ("quality_score", "Highest quality"),
+)
+
+# Per-criterion dispatch for compare_by_criteria:
+# (quote field, default, scale by quantity, display formatter, higher is better).
+# ComparisonCriteria is a str Enum, so plain strings look up the same entries.
+_CRITERIA_SPEC = {
+    ComparisonCriteria.PRICE: ("unit_price", 0, True, "${:.2f}".format, False),
+    ComparisonCriteria.LEAD_TIME: ("lead_time_days", 0, False, "{} days".format, False),
+    ComparisonCriteria.QUALITY: ("rating", 0, False, "{:.1f}/5.0".format, True),
+    ComparisonCriteria.RELIABILITY: ("on_time_pct", 95, False, "{:.1f}%".format, True),
+}
+
+# Two-line summary row rendered for each scored supplier
+_ROW_FMT = (
+    "{emoji} {name}: Score {overall}/100\n"
+    "   Price: {p:.0f} | Lead: {l:.0f} | Quality: {q:.0f} | Reliable: {r:.0f}"
+).format
+
 
 def normalize_score(
     value: float,
@@ -235,69 +328,48 @@ def score_supplier(
     )
 
 
-def compare_suppliers(
+def _rank_scores(scores: List[SupplierScore]) -> None:
+    """Assign ranks and recommendations to scores sorted best-first.
+
+    Args:
+        scores: Supplier scores ordered by descending overall score
+    """
+    for i, score in enumerate(scores):
+        score.rank = i + 1
+
+        # Generate recommendation
+        if score.rank == 1:
+            score.recommendation = "Best overall choice"
+        else:
+            score.recommendation = next(
+                (text for field, text in _RECOMMENDATION_RULES
+                 if getattr(score, field) >= RECOMMENDATION_THRESHOLD),
+                "Alternative option"
+            )
+
+
+def _build_comparison_result(
     product_id: str,
     product_name: str,
     quantity: int,
-    supplier_quotes: List[Dict[str, Any]],
-    weights: ComparisonWeights = None,
-    weight_profile: str = "balanced"
+    scores: List[SupplierScore],
+    all_prices: List[float],
+    all_lead_times: List[int]
 ) -> ComparisonResult:
-    """Compare multiple suppliers for a product.
+    """Rank sorted scores and wrap them with comparison notes.
 
     Args:
         product_id: Product identifier
         product_name: Product name
         quantity: Quantity needed
-        supplier_quotes: List of supplier quote data
-        weights: Optional custom weights
-        weight_profile: Name of weight profile to use if weights not provided
+        scores: Supplier scores ordered by descending overall score
+        all_prices: Total prices in original quote order
+        all_lead_times: Lead times in original quote order
 
     Returns:
         ComparisonResult with ranked suppliers
     """
-    if weights is None:
-        weights = WEIGHT_PROFILES.get(weight_profile, WEIGHT_PROFILES["balanced"])
-
-    logger.info(f"Comparing {len(supplier_quotes)} suppliers for {product_name} (qty: {quantity})")
-
-    # Extract all prices and lead times for normalization
-    all_prices = [q.get("unit_price", 0) * quantity for q in supplier_quotes]
-    all_lead_times = [q.get("lead_time_days", 0) for q in supplier_quotes]
-
-    # Score each supplier
-    scores = []
-    for quote in supplier_quotes:
-        total_price = quote.get("unit_price", 0) * quantity
-
-        score = score_supplier(
-            supplier_id=quote.get("supplier_id", ""),
-            supplier_name=quote.get("supplier_name", ""),
-            price=total_price,
-            lead_time=quote.get("lead_time_days", 0),
-            rating=quote.get("rating", 4.0),
-            all_prices=all_prices,
-            all_lead_times=all_lead_times,
-            weights=weights
-        )
-        scores.append(score)
-
-    # Rank suppliers by overall score
-    scores.sort(key=lambda x: x.overall_score, reverse=True)
-    for i, score in enumerate(scores):
-        score.rank = i + 1
-
-        # Generate recommendation
-        if score.rank == 1:
-            score.recommendation = "Best overall choice"
-        elif score.price_score >= 90:
-            score.recommendation = "Best price option"
-        elif score.lead_time_score >= 90:
-            score.recommendation = "Fastest delivery"
-        elif score.quality_score >= 90:
-            score.recommendation = "Highest quality"
-        else:
-            score.recommendation = "Alternative option"
+    _rank_scores(scores)
 
     # Build comparison notes
     notes = []
@@ -320,7 +392,7 @@ def compare_suppliers(
         if fastest[0] != slowest[0]:
             notes.append(f"Lead time: {fastest[1]}-{slowest[1]} days")
 
-    result = ComparisonResult(
+    return ComparisonResult(
         product_id=product_id,
         product_name=product_name,
         quantity=quantity,
@@ -329,52 +401,251 @@ def compare_suppliers(
         comparison_notes=notes
     )
 
+
+@lru_cache(maxsize=256)
+def _score_bundle(
+    bundle: QuotesBundle,
+    quantity: int,
+    weights_key: Tuple[float, float, float, float]
+) -> Tuple[SupplierScore, ...]:
+    """Score every supplier in a bundle, in quote order.
+
+    Cached results are shared, so callers must copy before mutating.
+
+    Args:
+        bundle: Supplier quotes to score
+        quantity: Quantity needed
+        weights_key: ComparisonWeights fields as a tuple
+
+    Returns:
+        Tuple of SupplierScore objects
+    """
+    weights = ComparisonWeights(*weights_key)
+    all_prices = [price * quantity for price in bundle.unit_prices]
+    all_lead_times = list(bundle.lead_times)
+
+    return tuple(
+        score_supplier(
+            supplier_id=bundle.supplier_ids[i],
+            supplier_name=bundle.supplier_names[i],
+            price=all_prices[i],
+            lead_time=bundle.lead_times[i],
+            rating=bundle.ratings[i],
+            all_prices=all_prices,
+            all_lead_times=all_lead_times,
+            weights=weights
+        )
+        for i in range(len(bundle))
+    )
+
+
+def compare_suppliers(
+    product_id: str,
+    product_name: str,
+    quantity: int,
+    supplier_quotes: QuotesInput,
+    weights: ComparisonWeights = None,
+    weight_profile: str = "balanced"
+) -> ComparisonResult:
+    """Compare multiple suppliers for a product.
+
+    Args:
+        product_id: Product identifier
+        product_name: Product name
+        quantity: Quantity needed
+        supplier_quotes: List of supplier quote data or a QuotesBundle
+        weights: Optional custom weights
+        weight_profile: Name of weight profile to use if weights not provided
+
+    Returns:
+        ComparisonResult with ranked suppliers
+    """
+    if weights is None:
+        weights = WEIGHT_PROFILES.get(weight_profile, WEIGHT_PROFILES["balanced"])
+
+    logger.info(f"Comparing {len(supplier_quotes)} suppliers for {product_name} (qty: {quantity})")
+
+    bundle = _as_bundle(supplier_quotes)
+    all_prices = [price * quantity for price in bundle.unit_prices]
+    all_lead_times = list(bundle.lead_times)
+
+    # Score each supplier (cached per bundle, quantity and weights)
+    scores = [
+        score.model_copy()
+        for score in _score_bundle(bundle, quantity, astuple(weights))
+    ]
+
+    # Rank suppliers by overall score (keys extracted once, ties keep quote order)
+    keys = [-score.overall_score for score in scores]
+    scores = [scores[i] for i in sorted(range(len(scores)), key=keys.__getitem__)]
+
+    result = _build_comparison_result(
+        product_id, product_name, quantity, scores, all_prices, all_lead_times
+    )
+
     logger.info(f"Comparison complete. Best: {result.best_supplier.supplier_name if result.best_supplier else 'None'}")
     return result
 
 
+def compare_suppliers_batch(
+    product_quotes: Dict[str, QuotesInput],
+    quantities: Dict[str, int],
+    weights: ComparisonWeights = None,
+    weight_profile: str = "balanced",
+    product_names: Optional[Dict[str, str]] = None
+) -> List[ComparisonResult]:
+    """Compare suppliers for many products in a single scoring pass.
+
+    Quotes are padded into (products x suppliers) arrays so score
+    normalization runs once for the whole batch. Results match calling
+    compare_suppliers for each product.
+
+    Args:
+        product_quotes: Supplier quotes (list or QuotesBundle) keyed by product ID
+        quantities: Quantity needed keyed by product ID
+        weights: Optional custom weights
+        weight_profile: Name of weight profile to use if weights not provided
+        product_names: Optional product names keyed by product ID
+
+    Returns:
+        ComparisonResult for each product, in input order
+    """
+    if weights is None:
+        weights = WEIGHT_PROFILES.get(weight_profile, WEIGHT_PROFILES["balanced"])
+    product_names = product_names or {}
+
+    product_ids = list(product_quotes)
+    if not product_ids:
+        return []
+
+    logger.info(f"Batch comparing suppliers for {len(product_ids)} products")
+
+    bundles = [_as_bundle(product_quotes[pid]) for pid in product_ids]
+    counts = [len(bundle) for bundle in bundles]
+    shape = (len(product_ids), max(max(counts), 1))
+
+    # Pad ragged quote lists with NaN so missing suppliers drop out of min/max
+    prices = np.full(shape, np.nan)
+    lead_times = np.full(shape, np.nan)
+    ratings = np.full(shape, np.nan)
+    price_lists = []
+    lead_time_lists = []
+    for i, (pid, bundle) in enumerate(zip(product_ids, bundles)):
+        quantity = quantities.get(pid, 1)
+        price_lists.append([price * quantity for price in bundle.unit_prices])
+        lead_time_lists.append(list(bundle.lead_times))
+        prices[i, :counts[i]] = price_lists[i]
+        lead_times[i, :counts[i]] = lead_time_lists[i]
+        ratings[i, :counts[i]] = bundle.ratings
+
+    def _inverted_scores(values: np.ndarray) -> np.ndarray:
+        # fmin/fmax skip NaN padding without warning on empty rows
+        low = np.fmin.reduce(values, axis=1, keepdims=True)
+        span = np.fmax.reduce(values, axis=1, keepdims=True) - low
+        safe_span = np.where(span == 0, 1.0, span)
+        normalized = (1 - (values - low) / safe_span) * 100
+        return np.where(span == 0, 50.0, normalized)
+
+    with np.errstate(invalid="ignore"):
+        price_scores = _inverted_scores(prices)
+        lead_time_scores = _inverted_scores(lead_times)
+    quality_scores = (ratings / 5.0) * 100
+
+    # Round with Python's round() rather than np.round, which can differ on
+    # halfway values, so scores match score_supplier exactly
+    def _rounded_rows(values: np.ndarray) -> List[List[float]]:
+        return [[round(v, 2) for v in row] for row in values.tolist()]
+
+    price_rows = _rounded_rows(price_scores)
+    lead_rows = _rounded_rows(lead_time_scores)
+    quality_rows = _rounded_rows(quality_scores)
+
+    results = []
+    for i, (pid, bundle) in enumerate(zip(product_ids, bundles)):
+        count = counts[i]
+        scores = []
+        for j in range(count):
+            quality_score = quality_rows[i][j]
+            reliability_score = quality_score * 0.9 + 10
+            overall_score = (
+                price_rows[i][j] * weights.price +
+                lead_rows[i][j] * weights.lead_time +
+                quality_score * weights.quality +
+                reliability_score * weights.reliability
+            )
+            scores.append(SupplierScore(
+                supplier_id=bundle.supplier_ids[j],
+                supplier_name=bundle.supplier_names[j],
+                price_score=price_rows[i][j],
+                lead_time_score=lead_rows[i][j],
+                quality_score=quality_score,
+                reliability_score=reliability_score,
+                overall_score=round(overall_score, 2)
+            ))
+
+        # Stable sort keeps quote order on ties, as in compare_suppliers
+        keys = [-score.overall_score for score in scores]
+        scores = [scores[k] for k in sorted(range(count), key=keys.__getitem__)]
+        results.append(_build_comparison_result(
+            pid,
+            product_names.get(pid, pid),
+            quantities.get(pid, 1),
+            scores,
+            price_lists[i],
+            lead_time_lists[i]
+        ))
+
+    return results
+
+
 def compare_by_criteria(
-    supplier_quotes: List[Dict[str, Any]],
+    supplier_quotes: QuotesInput,
     criteria: ComparisonCriteria,
     quantity: int = 1
 ) -> List[Dict[str, Any]]:
     """Compare suppliers by a specific criterion.
 
     Args:
-        supplier_quotes: List of supplier quote data
+        supplier_quotes: List of supplier quote data or a QuotesBundle
         criteria: Criterion to compare by
         quantity: Quantity for price calculations
 
     Returns:
         Sorted list of suppliers with rankings
     """
-    ranked = []
-
-    for quote in supplier_quotes:
-        entry = {
-            "supplier_id": quote.get("supplier_id"),
-            "supplier_name": quote.get("supplier_name"),
-            "value": 0,
-            "rank": 0
-        }
-
-        if criteria == ComparisonCriteria.PRICE:
-            entry["value"] = quote.get("unit_price", 0) * quantity
-            entry["display"] = f"${entry['value']:.2f}"
-        elif criteria == ComparisonCriteria.LEAD_TIME:
-            entry["value"] = quote.get("lead_time_days", 0)
-            entry["display"] = f"{entry['value']} days"
-        elif criteria == ComparisonCriteria.QUALITY:
-            entry["value"] = quote.get("rating", 0)
-            entry["display"] = f"{entry['value']:.1f}/5.0"
-        elif criteria == ComparisonCriteria.RELIABILITY:
-            entry["value"] = quote.get("on_time_pct", 95)
-            entry["display"] = f"{entry['value']:.1f}%"
-
-        ranked.append(entry)
+    if isinstance(supplier_quotes, QuotesBundle):
+        supplier_quotes = supplier_quotes.quotes
+
+    spec = _CRITERIA_SPEC.get(criteria)
+
+    if spec is None:
+        # No per-quote value for this criterion (e.g. OVERALL)
+        ranked = [
+            {
+                "supplier_id": quote.get("supplier_id"),
+                "supplier_name": quote.get("supplier_name"),
+                "value": 0,
+                "rank": 0
+            }
+            for quote in supplier_quotes
+        ]
+        reverse = False
+    else:
+        key, default, per_unit, display, reverse = spec
+        ranked = []
+        for quote in supplier_quotes:
+            value = quote.get(key, default)
+            if per_unit:
+                value *= quantity
+            ranked.append({
+                "supplier_id": quote.get("supplier_id"),
+                "supplier_name": quote.get("supplier_name"),
+                "value": value,
+                "rank": 0,
+                "display": display(value)
+            })
 
     # Sort (lower is better for price and lead time, higher is better for quality/reliability)
-    reverse = criteria in [ComparisonCriteria.QUALITY, ComparisonCriteria.RELIABILITY]
     ranked.sort(key=lambda x: x["value"], reverse=reverse)
 
     # Assign ranks
@@ -385,7 +656,7 @@ def compare_by_criteria(
 
 
 def find_best_value(
-    supplier_quotes: List[Dict[str, Any]],
+    supplier_quotes: QuotesInput,
     quantity: int,
     max_lead_time: Optional[int] = None,
     min_rating: Optional[float] = None
@@ -393,7 +664,7 @@ def find_best_value(
     """Find the best value supplier with optional constraints.
 
     Args:
-        supplier_quotes: List of supplier quote data
+        supplier_quotes: List of supplier quote data or a QuotesBundle
         quantity: Quantity needed
         max_lead_time: Maximum acceptable lead time
         min_rating: Minimum acceptable rating
@@ -401,8 +672,11 @@ def find_best_value(
     Returns:
         Best supplier quote or None if no match
     """
+    if isinstance(supplier_quotes, QuotesBundle):
+        supplier_quotes = supplier_quotes.quotes
+
     # Filter by constraints
-    filtered = supplier_quotes.copy()
+    filtered = list(supplier_quotes)
 
     if max_lead_time is not None:
         filtered = [q for q in filtered if q.get("lead_time_days", 999) <= max_lead_time]
@@ -436,19 +710,21 @@ def generate_comparison_summary(results: List[ComparisonResult]) -> str:
         lines.append(f"\n📦 {result.product_name} (Qty: {result.quantity})")
         lines.append("-" * 30)
 
-        for score in result.supplier_scores:
-            rank_emoji = "🥇" if score.rank == 1 else "🥈" if score.rank == 2 else "🥉" if score.rank == 3 else f"#{score.rank}"
-            lines.append(
-                f"{rank_emoji} {score.supplier_name}: Score {score.overall_score}/100"
-            )
-            lines.append(
-                f"   Price: {score.price_score:.0f} | Lead: {score.lead_time_score:.0f} | "
-                f"Quality: {score.quality_score:.0f} | Reliable: {score.reliability_score:.0f}"
+        lines.extend([
+            _ROW_FMT(
+                emoji=RANK_EMOJI.get(score.rank) or f"#{score.rank}",
+                name=score.supplier_name,
+                overall=score.overall_score,
+                p=score.price_score,
+                l=score.lead_time_score,
+                q=score.quality_score,
+                r=score.reliability_score,
             )
+            for score in result.supplier_scores
+        ])
 
         if result.comparison_notes:
             lines.append("\n💡 Notes:")
-            for note in result.comparison_notes:
-                lines.append(f"   • {note}")
+            lines.extend([f"   • {note}" for note in result.comparison_notes])
 
     return "\n".join(lines)
@@ -5,12 +5,22 @@ purchase order validation, supplier validation, inventory validation,
 and approval workflow validation.
 """
 
+import io
 import logging
-from typing import List, Dict, Any, Optional, Tuple, Callable
+import sys
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Callable, FrozenSet, Sequence
 from pydantic import BaseModel, Field
 from enum import Enum
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Optional JIT for batch line item scans
+    numba = None
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +74,51 @@ class ValidationRule:
     severity: ValidationSeverity
     validator: Callable[[Dict[str, Any]], Tuple[bool, str, Optional[Dict[str, Any]]]]
     enabled: bool = True
+    depends_on: Tuple[str, ...] = ()  # Rules that must not have failed (fast_fail mode)
+    stop_on_fail: bool = False  # Skip all later rules if this fails (fast_fail mode)
+
+    def __post_init__(self):
+        # Every result for this rule shares one copy of its ID and name
+        self.rule_id = sys.intern(self.rule_id)
+        self.rule_name = sys.intern(self.rule_name)
+
+
+@dataclass(slots=True, frozen=True)
+class _ValidationResultFast:
+    """Immutable, slotted copy of a ValidationResult kept in the report cache.
+
+    Cached reports hold these instead of pydantic models so entries stay
+    small and callers never share result objects with the cache.
+    """
+    rule_id: str
+    rule_name: str
+    category: ValidationCategory
+    severity: ValidationSeverity
+    passed: bool
+    message: str
+    details: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_result(cls, result: ValidationResult) -> "_ValidationResultFast":
+        """Snapshot a ValidationResult."""
+        details = result.details
+        return cls(
+            result.rule_id, result.rule_name, result.category, result.severity,
+            result.passed, result.message, dict(details) if details is not None else None
+        )
+
+    def to_pydantic(self) -> ValidationResult:
+        """Build a fresh ValidationResult (fields are trusted, not re-validated)."""
+        details = self.details
+        return ValidationResult.model_construct(
+            rule_id=self.rule_id,
+            rule_name=self.rule_name,
+            category=self.category,
+            severity=self.severity,
+            passed=self.passed,
+            message=self.message,
+            details=dict(details) if details is not None else None
+        )
 
 
 # Business rule thresholds
@@ -81,13 +136,62 @@ THRESHOLDS = {
 # Approved suppliers list
 APPROVED_SUPPLIERS = ["SUP001", "SUP002", "SUP003"]
 
+# Threshold values bound once at import so validators skip the dict lookups.
+# THRESHOLDS and APPROVED_SUPPLIERS remain the public reference values.
+_MAX_PO_VALUE = THRESHOLDS["max_po_value"]
+_HIGH_VALUE_PO = THRESHOLDS["high_value_po"]
+_MAX_LINE_ITEMS = THRESHOLDS["max_line_items"]
+_MAX_QUANTITY_PER_ITEM = THRESHOLDS["max_quantity_per_item"]
+_MIN_ORDER_VALUE = THRESHOLDS["min_order_value"]
+_MAX_LEAD_TIME_DAYS = THRESHOLDS["max_lead_time_days"]
+_MIN_SUPPLIER_RATING = THRESHOLDS["min_supplier_rating"]
+_APPROVED_SUPPLIERS: FrozenSet[str] = frozenset(APPROVED_SUPPLIERS)
+
+
+@dataclass(slots=True)
+class _PoView:
+    """PO fields read by the built-in rules, extracted once per validation.
+
+    Values are taken as-is (with the rules' defaults) so malformed data
+    still fails inside the rule that reads it.
+    """
+    total_amount: Any
+    subtotal: Any
+    tax_rate: Any
+    tax_amount: Any
+    supplier_id: Any
+    line_items: Any
+    scan: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_PoView":
+        """Extract the rule fields from a PO data dictionary."""
+        return cls(
+            total_amount=data.get("total_amount", 0),
+            subtotal=data.get("subtotal", 0),
+            tax_rate=data.get("tax_rate", 0.08),
+            tax_amount=data.get("tax_amount", 0),
+            supplier_id=data.get("supplier_id", ""),
+            line_items=data.get("line_items", []),
+        )
+
 
 def validate_po_value(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate purchase order value limits."""
-    total = data.get("total_amount", 0)
-    max_value = THRESHOLDS["max_po_value"]
+    return _check_po_value(_PoView.from_dict(data))
 
-    if total > max_value:
+
+def _check_po_value(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate purchase order value limits (engine path)."""
+    total = po.total_amount
+    return _po_value_outcome(total, total > _MAX_PO_VALUE)
+
+
+def _po_value_outcome(total: float, exceeded: bool) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Build the PO value rule result for an already-evaluated check."""
+    max_value = _MAX_PO_VALUE
+
+    if exceeded:
         return (
             False,
             f"PO value ${total:.2f} exceeds maximum allowed ${max_value:.2f}",
@@ -99,10 +203,20 @@ def validate_po_value(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[st
 
 def validate_high_value_approval(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Check if high-value PO needs approval."""
-    total = data.get("total_amount", 0)
-    threshold = THRESHOLDS["high_value_po"]
+    return _check_high_value_approval(_PoView.from_dict(data))
+
 
-    if total > threshold:
+def _check_high_value_approval(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Check if high-value PO needs approval (engine path)."""
+    total = po.total_amount
+    return _high_value_outcome(total, total > _HIGH_VALUE_PO)
+
+
+def _high_value_outcome(total: float, is_high_value: bool) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Build the high-value approval rule result for an already-evaluated check."""
+    threshold = _HIGH_VALUE_PO
+
+    if is_high_value:
         return (
             False,
             f"High-value PO (${total:.2f}) requires manager approval (threshold: ${threshold:.2f})",
@@ -114,9 +228,15 @@ def validate_high_value_approval(data: Dict[str, Any]) -> Tuple[bool, str, Optio
 
 def validate_supplier_approved(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate that supplier is on approved list."""
-    supplier_id = data.get("supplier_id", "")
+    return _check_supplier_approved(_PoView.from_dict(data))
+
 
-    if supplier_id not in APPROVED_SUPPLIERS:
+def _check_supplier_approved(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate that supplier is on approved list (engine path)."""
+    supplier_id = po.supplier_id
+
+    # Non-string IDs (e.g. a dict from LLM-parsed input) are unhashable or never approved
+    if not isinstance(supplier_id, str) or supplier_id not in _APPROVED_SUPPLIERS:
         return (
             False,
             f"Supplier {supplier_id} is not on the approved suppliers list",
@@ -128,9 +248,14 @@ def validate_supplier_approved(data: Dict[str, Any]) -> Tuple[bool, str, Optiona
 
 def validate_line_items_count(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate number of line items."""
-    line_items = data.get("line_items", [])
+    return _check_line_items_count(_PoView.from_dict(data))
+
+
+def _check_line_items_count(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate number of line items (engine path)."""
+    line_items = po.line_items
     count = len(line_items)
-    max_items = THRESHOLDS["max_line_items"]
+    max_items = _MAX_LINE_ITEMS
 
     if count > max_items:
         return (
@@ -149,18 +274,96 @@ def validate_line_items_count(data: Dict[str, Any]) -> Tuple[bool, str, Optional
     return (True, f"Line items count ({count}) is valid", {"count": count})
 
 
-def validate_quantities(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
-    """Validate item quantities."""
-    line_items = data.get("line_items", [])
-    max_qty = THRESHOLDS["max_quantity_per_item"]
-    issues = []
+def _scan_line_items(line_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Collect quantity, line total and duplicate findings in one pass.
+
+    A malformed item stops only the check it breaks; the exception is kept
+    under that check's *_error key so its validator can re-raise it.
+
+    Args:
+        line_items: PO line item dictionaries
+
+    Returns:
+        Dict with qty_issues, total_issues, product_counts, duplicates
+        and the matching qty_error, total_error and duplicate_error
+    """
+    max_qty = _MAX_QUANTITY_PER_ITEM
+    qty_issues = []
+    total_issues = []
+    product_counts: Dict[Any, int] = {}
+    qty_error = total_error = duplicate_error = None
 
     for item in line_items:
         qty = item.get("quantity", 0)
-        if qty <= 0:
-            issues.append(f"{item.get('product_name', 'Unknown')}: quantity must be positive")
-        elif qty > max_qty:
-            issues.append(f"{item.get('product_name', 'Unknown')}: quantity {qty} exceeds max {max_qty}")
+        price = item.get("unit_price", 0)
+        name = item.get("product_name", "Unknown")
+
+        if qty_error is None:
+            try:
+                if qty <= 0:
+                    qty_issues.append(f"{name}: quantity must be positive")
+                elif qty > max_qty:
+                    qty_issues.append(f"{name}: quantity {qty} exceeds max {max_qty}")
+            except Exception as e:
+                qty_error = e
+
+        if total_error is None:
+            try:
+                line_total = item.get("line_total", 0)
+                expected = qty * price
+                if abs(line_total - expected) > 0.01:
+                    total_issues.append(
+                        f"{name}: line_total ${line_total:.2f} "
+                        f"doesn't match {qty} x ${price:.2f} = ${expected:.2f}"
+                    )
+            except Exception as e:
+                total_error = e
+
+        if duplicate_error is None:
+            try:
+                pid = item.get("product_id")
+                product_counts[pid] = product_counts.get(pid, 0) + 1
+            except Exception as e:
+                duplicate_error = e
+
+    return {
+        "qty_issues": qty_issues,
+        "total_issues": total_issues,
+        "product_counts": product_counts,
+        "duplicates": [pid for pid, count in product_counts.items() if count > 1],
+        "qty_error": qty_error,
+        "total_error": total_error,
+        "duplicate_error": duplicate_error,
+    }
+
+
+def _get_line_item_scan(po: _PoView, error_key: str) -> Dict[str, Any]:
+    """Return the cached line item scan, re-raising the check's own error.
+
+    Args:
+        po: PO view, optionally carrying a precomputed scan
+        error_key: Scan key holding the exception for the calling check
+
+    Returns:
+        Line item scan dict
+    """
+    scan = po.scan
+    if scan is None:
+        scan = _scan_line_items(po.line_items)
+    if scan[error_key] is not None:
+        raise scan[error_key]
+    return scan
+
+
+def validate_quantities(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate item quantities."""
+    return _check_quantities(_PoView.from_dict(data))
+
+
+def _check_quantities(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate item quantities (engine path)."""
+    line_items = po.line_items
+    issues = _get_line_item_scan(po, "qty_error")["qty_issues"]
 
     if issues:
         return (
@@ -174,20 +377,13 @@ def validate_quantities(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[
 
 def validate_line_totals(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate that line totals match calculations."""
-    line_items = data.get("line_items", [])
-    issues = []
+    return _check_line_totals(_PoView.from_dict(data))
 
-    for item in line_items:
-        qty = item.get("quantity", 0)
-        price = item.get("unit_price", 0)
-        line_total = item.get("line_total", 0)
-        expected = qty * price
 
-        if abs(line_total - expected) > 0.01:
-            issues.append(
-                f"{item.get('product_name', 'Unknown')}: line_total ${line_total:.2f} "
-                f"doesn't match {qty} x ${price:.2f} = ${expected:.2f}"
-            )
+def _check_line_totals(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate that line totals match calculations (engine path)."""
+    line_items = po.line_items
+    issues = _get_line_item_scan(po, "total_error")["total_issues"]
 
     if issues:
         return (
@@ -201,19 +397,42 @@ def validate_line_totals(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict
 
 def validate_tax_calculation(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate tax calculation accuracy."""
-    subtotal = data.get("subtotal", 0)
-    tax_rate = data.get("tax_rate", 0.08)
-    tax_amount = data.get("tax_amount", 0)
-    total = data.get("total_amount", 0)
+    return _check_tax_calculation(_PoView.from_dict(data))
+
+
+def _check_tax_calculation(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate tax calculation accuracy (engine path)."""
+    subtotal = po.subtotal
+    tax_rate = po.tax_rate
+    tax_amount = po.tax_amount
+    total = po.total_amount
 
     expected_tax = round(subtotal * tax_rate, 2)
     expected_total = round(subtotal + expected_tax, 2)
 
+    return _tax_outcome(
+        subtotal, tax_rate, tax_amount, total, expected_tax, expected_total,
+        abs(tax_amount - expected_tax) > 0.01,
+        abs(total - expected_total) > 0.01
+    )
+
+
+def _tax_outcome(
+    subtotal: float,
+    tax_rate: float,
+    tax_amount: float,
+    total: float,
+    expected_tax: float,
+    expected_total: float,
+    tax_mismatch: bool,
+    total_mismatch: bool
+) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Build the tax calculation rule result for already-evaluated checks."""
     issues = []
-    if abs(tax_amount - expected_tax) > 0.01:
+    if tax_mismatch:
         issues.append(f"Tax amount ${tax_amount:.2f} doesn't match expected ${expected_tax:.2f}")
 
-    if abs(total - expected_total) > 0.01:
+    if total_mismatch:
         issues.append(f"Total ${total:.2f} doesn't match expected ${expected_total:.2f}")
 
     if issues:
@@ -232,10 +451,20 @@ def validate_tax_calculation(data: Dict[str, Any]) -> Tuple[bool, str, Optional[
 
 def validate_minimum_order(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate minimum order value."""
-    total = data.get("total_amount", 0)
-    min_value = THRESHOLDS["min_order_value"]
+    return _check_minimum_order(_PoView.from_dict(data))
+
+
+def _check_minimum_order(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Validate minimum order value (engine path)."""
+    total = po.total_amount
+    return _minimum_order_outcome(total, total < _MIN_ORDER_VALUE)
+
 
-    if total < min_value:
+def _minimum_order_outcome(total: float, below_minimum: bool) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Build the minimum order rule result for an already-evaluated check."""
+    min_value = _MIN_ORDER_VALUE
+
+    if below_minimum:
         return (
             False,
             f"Order total ${total:.2f} is below minimum ${min_value:.2f}",
@@ -248,7 +477,7 @@ def validate_minimum_order(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Di
 def validate_supplier_rating(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate supplier meets minimum rating."""
     rating = data.get("supplier_rating", 5.0)
-    min_rating = THRESHOLDS["min_supplier_rating"]
+    min_rating = _MIN_SUPPLIER_RATING
 
     if rating < min_rating:
         return (
@@ -263,7 +492,7 @@ def validate_supplier_rating(data: Dict[str, Any]) -> Tuple[bool, str, Optional[
 def validate_lead_time(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate lead time is acceptable."""
     lead_time = data.get("lead_time_days", 0)
-    max_lead_time = THRESHOLDS["max_lead_time_days"]
+    max_lead_time = _MAX_LEAD_TIME_DAYS
 
     if lead_time > max_lead_time:
         return (
@@ -275,20 +504,34 @@ def validate_lead_time(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[s
     return (True, f"Lead time {lead_time} days is acceptable", {"lead_time": lead_time})
 
 
+def _parse_po_date(date_str: str) -> date:
+    """Parse a YYYY-MM-DD date, slicing exact-width strings directly.
+
+    Other inputs go through strptime, which also accepts unpadded forms
+    like 2024-1-5. Raises ValueError for invalid dates.
+    """
+    if (
+        len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-"
+        and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()
+    ):
+        return date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
 def validate_po_date(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Validate PO date is valid."""
     date_str = data.get("date_created", "")
 
     try:
         if date_str:
-            po_date = datetime.strptime(date_str, "%Y-%m-%d")
-            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            po_date = _parse_po_date(date_str)
+            today = date.today()
 
             if po_date < today:
                 return (
                     False,
                     f"PO date {date_str} is in the past",
-                    {"po_date": date_str, "today": today.strftime("%Y-%m-%d")}
+                    {"po_date": date_str, "today": today.isoformat()}
                 )
     except ValueError:
         return (
@@ -302,19 +545,22 @@ def validate_po_date(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str
 
 def validate_duplicate_items(data: Dict[str, Any]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Check for duplicate product IDs in line items."""
-    line_items = data.get("line_items", [])
-    product_ids = [item.get("product_id") for item in line_items]
-    duplicates = [pid for pid in product_ids if product_ids.count(pid) > 1]
+    return _check_duplicate_items(_PoView.from_dict(data))
 
-    if duplicates:
-        unique_duplicates = list(set(duplicates))
+
+def _check_duplicate_items(po: _PoView) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+    """Check for duplicate product IDs in line items (engine path)."""
+    scan = _get_line_item_scan(po, "duplicate_error")
+    unique_duplicates = scan["duplicates"]
+
+    if unique_duplicates:
         return (
             False,
             f"Duplicate products found: {', '.join(unique_duplicates)}",
             {"duplicates": unique_duplicates}
         )
 
-    return (True, "No duplicate products", {"unique_products": len(set(product_ids))})
+    return (True, "No duplicate products", {"unique_products": len(scan["product_counts"])})
 
 
 # Define all PO validation rules
@@ -352,14 +598,16 @@ PO_VALIDATION_RULES: List[ValidationRule] = [
         rule_name="Quantity Validation",
         category=ValidationCategory.DATA_INTEGRITY,
         severity=ValidationSeverity.ERROR,
-        validator=validate_quantities
+        validator=validate_quantities,
+        depends_on=("PO004",)
     ),
     ValidationRule(
         rule_id="PO006",
         rule_name="Line Total Accuracy",
         category=ValidationCategory.DATA_INTEGRITY,
         severity=ValidationSeverity.ERROR,
-        validator=validate_line_totals
+        validator=validate_line_totals,
+        depends_on=("PO004",)
     ),
     ValidationRule(
         rule_id="PO007",
@@ -380,20 +628,393 @@ PO_VALIDATION_RULES: List[ValidationRule] = [
         rule_name="Duplicate Items",
         category=ValidationCategory.DATA_INTEGRITY,
         severity=ValidationSeverity.WARNING,
-        validator=validate_duplicate_items
+        validator=validate_duplicate_items,
+        depends_on=("PO004",)
     ),
 ]
 
+# Built-in validators mapped to their _PoView implementations, so the engine
+# reads PO fields once instead of once per rule
+_VIEW_VALIDATORS: Dict[Callable, Callable[[_PoView], Tuple[bool, str, Optional[Dict[str, Any]]]]] = {
+    validate_po_value: _check_po_value,
+    validate_high_value_approval: _check_high_value_approval,
+    validate_supplier_approved: _check_supplier_approved,
+    validate_line_items_count: _check_line_items_count,
+    validate_quantities: _check_quantities,
+    validate_line_totals: _check_line_totals,
+    validate_tax_calculation: _check_tax_calculation,
+    validate_minimum_order: _check_minimum_order,
+    validate_duplicate_items: _check_duplicate_items,
+}
+
+# Enabled rules flattened to tuples for the validation loop:
+# (rule_id, rule_name, category, severity, validator, takes_view,
+#  depends_on, stop_on_fail).
+# Recompiled automatically when rules are added, removed or toggled;
+# call reload_po_rules() after editing other rule fields at runtime.
+_CompiledRule = Tuple[
+    str, str, ValidationCategory, ValidationSeverity, Callable, bool, Tuple[str, ...], bool
+]
+
+
+def _coerce_enum(enum_cls: type, value: Any) -> Any:
+    """Convert a plain value (e.g. "error") to its enum member, if it has one."""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return value
+
+
+def _compile_rules(rules: Sequence[ValidationRule]) -> Tuple[_CompiledRule, ...]:
+    """Flatten enabled validation rules into tuples for the rule engine.
+
+    Severity and category are coerced to their enums here, so custom rules
+    declared with strings are counted by the engine's identity checks.
+    """
+    compiled = []
+    for rule in rules:
+        if not rule.enabled:
+            continue
+        view_validator = _VIEW_VALIDATORS.get(rule.validator)
+        compiled.append((
+            rule.rule_id, rule.rule_name,
+            _coerce_enum(ValidationCategory, rule.category),
+            _coerce_enum(ValidationSeverity, rule.severity),
+            view_validator or rule.validator, view_validator is not None,
+            rule.depends_on, rule.stop_on_fail
+        ))
+    return tuple(compiled)
+
+
+_PO_RULES_COMPILED: Tuple[_CompiledRule, ...] = ()
+# (rule identity, enabled) per rule at the last compile; holding the rule
+# objects keeps their ids from being reused while the key is live
+_po_rules_key: Tuple[Tuple[int, bool], ...] = ()
+_po_rules_source: Tuple[ValidationRule, ...] = ()
+
+# LRU cache of PO validation reports keyed by canonical PO content
+_REPORT_CACHE_SIZE = 512
+_report_cache: "OrderedDict[Any, Tuple[ValidationReport, Tuple[_ValidationResultFast, ...]]]" = OrderedDict()
+_report_cache_lock = threading.Lock()
+_DICT_MARKER = object()
+
+
+def reload_po_rules() -> None:
+    """Recompile PO_VALIDATION_RULES and drop cached validation reports."""
+    global _PO_RULES_COMPILED, _po_rules_key, _po_rules_source
+    _po_rules_source = tuple(PO_VALIDATION_RULES)
+    _po_rules_key = tuple((id(rule), rule.enabled) for rule in _po_rules_source)
+    _PO_RULES_COMPILED = _compile_rules(_po_rules_source)
+    with _report_cache_lock:
+        _report_cache.clear()
+
+
+def _po_rules() -> Tuple[_CompiledRule, ...]:
+    """Return the compiled PO rules, recompiling if the rule list changed.
 
-def validate_purchase_order(po_data: Dict[str, Any]) -> ValidationReport:
+    Returns:
+        Compiled rule tuples for the enabled rules in PO_VALIDATION_RULES
+    """
+    key = tuple((id(rule), rule.enabled) for rule in PO_VALIDATION_RULES)
+    if key != _po_rules_key:
+        reload_po_rules()
+    return _PO_RULES_COMPILED
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into hashable tuples.
+
+    Scalars are tagged with their type so that 1, 1.0 and True (which
+    compare and hash equal) produce different keys.
+    """
+    if isinstance(value, dict):
+        return (_DICT_MARKER, tuple(sorted((_freeze(k), _freeze(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    return (type(value), value)
+
+
+def validate_purchase_order(
+    po_data: Dict[str, Any],
+    fast_fail: bool = False,
+    use_cache: bool = True
+) -> ValidationReport:
     """Run all validation rules against a purchase order.
 
+    With fast_fail, a rule whose depends_on includes a failed ERROR rule
+    (e.g. line item checks after "PO must have at least one line item")
+    is not run and is reported as a passing INFO result instead. A failed
+    stop_on_fail rule skips every later rule the same way.
+
+    Reports are cached by PO content (and today's date, for the PO date
+    rule), so revalidating an unchanged PO returns a copy of the earlier
+    report with a fresh timestamp. This assumes po_data is not mutated
+    in place between calls; pass use_cache=False if it is.
+
+    Args:
+        po_data: Purchase order data dictionary
+        fast_fail: Skip rules whose prerequisites already failed
+        use_cache: Reuse reports for identical PO content
+
+    Returns:
+        ValidationReport with all results
+    """
+    # Picks up rule list changes (and drops stale reports) before the cache lookup
+    _po_rules()
+
+    key = None
+    if use_cache:
+        try:
+            key = (_freeze(po_data), fast_fail, date.today())
+            with _report_cache_lock:
+                cached = _report_cache.get(key)
+                if cached is not None:
+                    _report_cache.move_to_end(key)
+        except TypeError:
+            # Unhashable or unsortable content; validate without caching
+            key = cached = None
+
+        if cached is not None:
+            summary, fast_results = cached
+            logger.debug(f"Using cached validation report for {summary.entity_id}")
+            return summary.model_copy(update={
+                "timestamp": datetime.now(),
+                "results": [r.to_pydantic() for r in fast_results],
+                "approval_reasons": list(summary.approval_reasons),
+            })
+
+    report = _run_po_rules(po_data, fast_fail)
+
+    if key is not None:
+        entry = (
+            report.model_copy(update={
+                "results": [],
+                "approval_reasons": list(report.approval_reasons),
+            }),
+            tuple(_ValidationResultFast.from_result(r) for r in report.results),
+        )
+        with _report_cache_lock:
+            _report_cache[key] = entry
+            if len(_report_cache) > _REPORT_CACHE_SIZE:
+                _report_cache.popitem(last=False)
+
+    return report
+
+
+def _line_item_kernel_numpy(
+    qty: np.ndarray,
+    price: np.ndarray,
+    line_total: np.ndarray,
+    codes: np.ndarray,
+    n_codes: int,
+    max_qty: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flag bad quantities and line totals and count product codes."""
+    qty_bad = (qty <= 0) | (qty > max_qty)
+    total_bad = np.abs(line_total - qty * price) > 0.01
+    counts = np.bincount(codes, minlength=n_codes)
+    return qty_bad, total_bad, counts
+
+
+def _line_item_kernel_loop(qty, price, line_total, codes, n_codes, max_qty):
+    """Single-loop version of _line_item_kernel_numpy for Numba to compile."""
+    n = qty.shape[0]
+    qty_bad = np.zeros(n, dtype=np.bool_)
+    total_bad = np.zeros(n, dtype=np.bool_)
+    counts = np.zeros(n_codes, dtype=np.int64)
+    for i in range(n):
+        q = qty[i]
+        qty_bad[i] = q <= 0 or q > max_qty
+        total_bad[i] = abs(line_total[i] - q * price[i]) > 0.01
+        counts[codes[i]] += 1
+    return qty_bad, total_bad, counts
+
+
+# fastmath is left off so NaN and threshold comparisons match the Python rules
+_line_item_kernel = (
+    numba.njit(cache=True)(_line_item_kernel_loop) if numba is not None
+    else _line_item_kernel_numpy
+)
+
+
+def _batch_scan_line_items(pos: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """Scan line items for a batch of POs with one array kernel call.
+
+    Line items from every PO are flattened into quantity, price and total
+    arrays, and product IDs are encoded to per-PO integer codes so the
+    kernel can count duplicates. POs with non-numeric or malformed items
+    get None and are scanned by the regular per-PO path.
+
+    Args:
+        pos: Purchase order data dictionaries
+
+    Returns:
+        Line item scan dict (as from _scan_line_items) or None per PO
+    """
+    qty, price, line_total, codes = [], [], [], []
+    n_codes = 0
+    po_items = []  # (items, start offset, product code map) or None
+    numeric = (int, float)
+
+    for po in pos:
+        items = po.get("line_items", [])
+        try:
+            item_qty = [item.get("quantity", 0) for item in items]
+            item_price = [item.get("unit_price", 0) for item in items]
+            item_total = [item.get("line_total", 0) for item in items]
+            if not all(type(v) in numeric for v in item_qty + item_price + item_total):
+                po_items.append(None)
+                continue
+
+            # Codes are unique across the batch so one bincount serves every PO
+            product_codes: Dict[Any, int] = {}
+            item_codes = []
+            for item in items:
+                pid = item.get("product_id")
+                code = product_codes.get(pid)
+                if code is None:
+                    code = product_codes[pid] = n_codes + len(product_codes)
+                item_codes.append(code)
+        except Exception:
+            po_items.append(None)
+            continue
+
+        po_items.append((items, len(qty), product_codes))
+        qty.extend(item_qty)
+        price.extend(item_price)
+        line_total.extend(item_total)
+        codes.extend(item_codes)
+        n_codes += len(product_codes)
+
+    qty_bad, total_bad, counts = _line_item_kernel(
+        np.array(qty, dtype=np.float64),
+        np.array(price, dtype=np.float64),
+        np.array(line_total, dtype=np.float64),
+        np.array(codes, dtype=np.int64),
+        n_codes,
+        float(_MAX_QUANTITY_PER_ITEM)
+    )
+    qty_bad = qty_bad.tolist()
+    total_bad = total_bad.tolist()
+    counts = counts.tolist()
+
+    scans = []
+    for entry in po_items:
+        if entry is None:
+            scans.append(None)
+            continue
+        items, start, product_codes = entry
+        qty_issues = []
+        total_issues = []
+        for offset, item in enumerate(items):
+            i = start + offset
+            if qty_bad[i] or total_bad[i]:
+                q, p, t = qty[i], price[i], line_total[i]
+                name = item.get("product_name", "Unknown")
+                if qty_bad[i]:
+                    qty_issues.append(
+                        f"{name}: quantity must be positive" if q <= 0
+                        else f"{name}: quantity {q} exceeds max {_MAX_QUANTITY_PER_ITEM}"
+                    )
+                if total_bad[i]:
+                    total_issues.append(
+                        f"{name}: line_total ${t:.2f} "
+                        f"doesn't match {q} x ${p:.2f} = ${q * p:.2f}"
+                    )
+        product_counts = {pid: counts[code] for pid, code in product_codes.items()}
+        scans.append({
+            "qty_issues": qty_issues,
+            "total_issues": total_issues,
+            "product_counts": product_counts,
+            "duplicates": [pid for pid, count in product_counts.items() if count > 1],
+            "qty_error": None,
+            "total_error": None,
+            "duplicate_error": None,
+        })
+
+    return scans
+
+
+def validate_purchase_orders_batch(pos: List[Dict[str, Any]]) -> List[ValidationReport]:
+    """Validate many purchase orders, evaluating numeric rules vectorized.
+
+    The value, high-value and minimum order checks run as NumPy array
+    comparisons across the whole batch, tax is checked per PO with the
+    same rounding as single-PO validation, and line items from all POs are
+    checked in one kernel call (JIT-compiled when numba is installed).
+    If any PO amount is not a plain int/float the batch falls back to
+    validate_purchase_order for every PO.
+
+    Args:
+        pos: Purchase order data dictionaries
+
+    Returns:
+        ValidationReport for each PO, in input order
+    """
+    if not pos:
+        return []
+
+    totals = [p.get("total_amount", 0) for p in pos]
+    subtotals = [p.get("subtotal", 0) for p in pos]
+    tax_rates = [p.get("tax_rate", 0.08) for p in pos]
+    tax_amounts = [p.get("tax_amount", 0) for p in pos]
+
+    columns = (totals, subtotals, tax_rates, tax_amounts)
+    if not all(type(v) in (int, float) for column in columns for v in column):
+        logger.debug("Non-numeric PO amounts in batch; validating POs individually")
+        return [validate_purchase_order(p, use_cache=False) for p in pos]
+
+    total_arr = np.array(totals, dtype=np.float64)
+    over_max = (total_arr > _MAX_PO_VALUE).tolist()
+    high_value = (total_arr > _HIGH_VALUE_PO).tolist()
+    below_min = (total_arr < _MIN_ORDER_VALUE).tolist()
+
+    # Expected tax uses Python's round() per PO, exactly as
+    # _check_tax_calculation does; np.round rounds some halves differently
+    expected_tax = [round(sub * rate, 2) for sub, rate in zip(subtotals, tax_rates)]
+    expected_total = [round(sub + tax, 2) for sub, tax in zip(subtotals, expected_tax)]
+    tax_mismatch = [abs(t - e) > 0.01 for t, e in zip(tax_amounts, expected_tax)]
+    total_mismatch = [abs(t - e) > 0.01 for t, e in zip(totals, expected_total)]
+
+    logger.info(f"Batch validating {len(pos)} purchase orders")
+
+    scans = _batch_scan_line_items(pos)
+
+    return [
+        _run_po_rules(po, False, scan=scans[i], precomputed={
+            "PO001": _po_value_outcome(totals[i], over_max[i]),
+            "PO002": _high_value_outcome(totals[i], high_value[i]),
+            "PO007": _tax_outcome(
+                subtotals[i], tax_rates[i], tax_amounts[i], totals[i],
+                expected_tax[i], expected_total[i],
+                tax_mismatch[i], total_mismatch[i]
+            ),
+            "PO008": _minimum_order_outcome(totals[i], below_min[i]),
+        })
+        for i, po in enumerate(pos)
+    ]
+
+
+def _run_po_rules(
+    po_data: Dict[str, Any],
+    fast_fail: bool,
+    precomputed: Optional[Dict[str, Tuple[bool, str, Optional[Dict[str, Any]]]]] = None,
+    scan: Optional[Dict[str, Any]] = None
+) -> ValidationReport:
+    """Run the compiled PO rules and build a ValidationReport.
+
     Args:
         po_data: Purchase order data dictionary
+        fast_fail: Skip rules whose prerequisites already failed
+        precomputed: Validator outputs already evaluated, keyed by rule ID
+        scan: Line item scan already computed for this PO
 
     Returns:
         ValidationReport with all results
     """
+    precomputed = precomputed or {}
     po_number = po_data.get("po_number", "UNKNOWN")
     logger.info(f"Validating purchase order: {po_number}")
 
@@ -403,18 +1024,48 @@ def validate_purchase_order(po_data: Dict[str, Any]) -> ValidationReport:
     requires_approval = False
     approval_reasons = []
 
-    for rule in PO_VALIDATION_RULES:
-        if not rule.enabled:
-            continue
-
+    # Extract rule fields and scan line items once for all built-in rules.
+    # If line_items cannot be iterated, each line item rule re-scans and reports it.
+    view = _PoView.from_dict(po_data)
+    view.scan = scan
+    if scan is None:
         try:
-            passed, message, details = rule.validator(po_data)
+            view.scan = _scan_line_items(view.line_items)
+        except Exception as e:
+            logger.debug(f"Line item scan failed for {po_number}: {e}")
+
+    failed_ids = set()
+    halted_by = None
+
+    # Rule metadata is trusted, so results skip pydantic field validation
+    for (rule_id, rule_name, category, severity, validator, takes_view,
+         depends_on, stop_on_fail) in _po_rules():
+        if fast_fail:
+            blockers = [halted_by] if halted_by else [d for d in depends_on if d in failed_ids]
+            if blockers:
+                results.append(ValidationResult.model_construct(
+                    rule_id=rule_id,
+                    rule_name=rule_name,
+                    category=category,
+                    severity=ValidationSeverity.INFO,
+                    passed=True,
+                    message=f"Skipped due to upstream failure: {', '.join(blockers)}",
+                    details={"skipped": True, "failed_dependencies": blockers}
+                ))
+                logger.debug(f"Rule {rule_id}: SKIPPED (upstream failure: {blockers})")
+                continue
 
-            result = ValidationResult(
-                rule_id=rule.rule_id,
-                rule_name=rule.rule_name,
-                category=rule.category,
-                severity=rule.severity,
+        try:
+            outcome = precomputed.get(rule_id)
+            if outcome is None:
+                outcome = validator(view if takes_view else po_data)
+            passed, message, details = outcome
+
+            result = ValidationResult.model_construct(
+                rule_id=rule_id,
+                rule_name=rule_name,
+                category=category,
+                severity=severity,
                 passed=passed,
                 message=message,
                 details=details
@@ -422,9 +1073,10 @@ def validate_purchase_order(po_data: Dict[str, Any]) -> ValidationReport:
             results.append(result)
 
             if not passed:
-                if rule.severity == ValidationSeverity.ERROR:
+                if severity is ValidationSeverity.ERROR:
                     error_count += 1
-                elif rule.severity == ValidationSeverity.WARNING:
+                    failed_ids.add(rule_id)
+                elif severity is ValidationSeverity.WARNING:
                     warning_count += 1
 
                 # Check if approval is required
@@ -432,24 +1084,29 @@ def validate_purchase_order(po_data: Dict[str, Any]) -> ValidationReport:
                     requires_approval = True
                     approval_reasons.append(message)
 
-            logger.debug(f"Rule {rule.rule_id}: {'PASS' if passed else 'FAIL'} - {message}")
+            logger.debug(f"Rule {rule_id}: {'PASS' if passed else 'FAIL'} - {message}")
 
         except Exception as e:
-            logger.error(f"Error running rule {rule.rule_id}: {e}")
-            results.append(ValidationResult(
-                rule_id=rule.rule_id,
-                rule_name=rule.rule_name,
-                category=rule.category,
+            logger.error(f"Error running rule {rule_id}: {e}")
+            results.append(ValidationResult.model_construct(
+                rule_id=rule_id,
+                rule_name=rule_name,
+                category=category,
                 severity=ValidationSeverity.ERROR,
                 passed=False,
                 message=f"Validation error: {str(e)}",
                 details={"exception": str(e)}
             ))
             error_count += 1
+            failed_ids.add(rule_id)
+            passed = False
+
+        if stop_on_fail and not passed and halted_by is None:
+            halted_by = rule_id
 
     is_valid = error_count == 0
 
-    report = ValidationReport(
+    report = ValidationReport.model_construct(
         entity_type="purchase_order",
         entity_id=po_number,
         is_valid=is_valid,
@@ -481,6 +1138,7 @@ def validate_inventory_item(item_data: Dict[str, Any]) -> ValidationReport:
     item_id = item_data.get("item_id", "UNKNOWN")
     results = []
     error_count = 0
+    warning_count = 0
 
     # Check required fields
     required_fields = ["item_id", "name", "current_stock", "reorder_point", "max_stock"]
@@ -534,17 +1192,29 @@ def validate_inventory_item(item_data: Dict[str, Any]) -> ValidationReport:
             message=f"Reorder point ({reorder}) exceeds max stock ({max_stock})",
             details={"reorder_point": reorder, "max_stock": max_stock}
         ))
+        warning_count += 1
 
     return ValidationReport(
         entity_type="inventory_item",
         entity_id=item_id,
         is_valid=error_count == 0,
         error_count=error_count,
-        warning_count=len([r for r in results if not r.passed and r.severity == ValidationSeverity.WARNING]),
+        warning_count=warning_count,
         results=results
     )
 
 
+# Result icons for format_validation_report: passed, else by severity
+_PASS_ICON = "✅"
+_ICON_MAP = {
+    ValidationSeverity.ERROR: "❌",
+    ValidationSeverity.WARNING: "⚠️",
+    ValidationSeverity.INFO: "⚠️",
+}
+_RULE_LINE = "=" * 50
+_DETAIL_LINE = "-" * 50
+
+
 def format_validation_report(report: ValidationReport) -> str:
     """Format a validation report for display.
 
@@ -554,31 +1224,29 @@ def format_validation_report(report: ValidationReport) -> str:
     Returns:
         Formatted string representation
     """
-    lines = [
-        f"{'='*50}",
-        f"Validation Report: {report.entity_type.upper()}",
-        f"ID: {report.entity_id}",
-        f"Timestamp: {report.timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
-        f"{'='*50}",
-        "",
-        f"Status: {'✅ VALID' if report.is_valid else '❌ INVALID'}",
-        f"Errors: {report.error_count} | Warnings: {report.warning_count}",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    w(f"{_RULE_LINE}\n")
+    w(f"Validation Report: {report.entity_type.upper()}\n")
+    w(f"ID: {report.entity_id}\n")
+    w(f"Timestamp: {report.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    w(f"{_RULE_LINE}\n\n")
+    w(f"Status: {'✅ VALID' if report.is_valid else '❌ INVALID'}\n")
+    w(f"Errors: {report.error_count} | Warnings: {report.warning_count}")
 
     if report.requires_approval:
-        lines.append(f"\n⚠️  REQUIRES APPROVAL:")
+        w("\n\n⚠️  REQUIRES APPROVAL:")
         for reason in report.approval_reasons:
-            lines.append(f"   • {reason}")
+            w(f"\n   • {reason}")
 
-    lines.append("\nDetails:")
-    lines.append("-" * 50)
+    w(f"\n\nDetails:\n{_DETAIL_LINE}")
 
+    icon_map = _ICON_MAP
     for result in report.results:
-        icon = "✅" if result.passed else "❌" if result.severity == ValidationSeverity.ERROR else "⚠️"
-        lines.append(f"{icon} [{result.rule_id}] {result.rule_name}")
-        lines.append(f"   {result.message}")
+        icon = _PASS_ICON if result.passed else icon_map.get(result.severity, "⚠️")
+        w(f"\n{icon} [{result.rule_id}] {result.rule_name}\n   {result.message}")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def quick_validate(po_data: Dict[str, Any]) -> Tuple[bool, List[str], List[str]]:
@@ -592,7 +1260,17 @@ def quick_validate(po_data: Dict[str, Any]) -> Tuple[bool, List[str], List[str]]
     """
     report = validate_purchase_order(po_data)
 
-    errors = [r.message for r in report.results if not r.passed and r.severity == ValidationSeverity.ERROR]
-    warnings = [r.message for r in report.results if not r.passed and r.severity == ValidationSeverity.WARNING]
+    errors: List[str] = []
+    warnings: List[str] = []
+    error, warning = ValidationSeverity.ERROR, ValidationSeverity.WARNING
+    for r in report.results:
+        if r.passed:
+            continue
+        # == rather than identity so plain-string severities are classified too
+        severity = r.severity
+        if severity == error:
+            errors.append(r.message)
+        elif severity == warning:
+            warnings.append(r.message)
 
     return (report.is_valid, errors, warnings)
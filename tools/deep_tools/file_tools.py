@@ -4,16 +4,191 @@ This module provides file operation tools that wrap the MCP filesystem server,
 exposing convenient functions for agents to read, write, and search files.
 """
 
+import fnmatch
 import logging
+import math
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 import json
 import csv
 
+try:
+    import orjson
+except ImportError:  # Optional faster JSON encode/decode
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
-def read_file(file_path: str, file_type: str = "auto") -> Any:
+def _load_json_bytes(data: bytes) -> Any:
+    """Parse a JSON document, preferring orjson when installed.
+
+    Documents orjson rejects (e.g. NaN literals or integers wider than
+    64 bits) are re-parsed with the stdlib so behaviour matches json.load.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _has_non_finite(value: Any) -> bool:
+    """Check whether a JSON payload contains a NaN or infinite float."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def _dump_json_bytes(content: Any) -> bytes:
+    """Serialize content as indented JSON, preferring orjson when installed.
+
+    orjson writes NaN and Infinity as null, so payloads containing them go
+    through the stdlib, which keeps the NaN/Infinity literals json.load reads.
+    """
+    if orjson is not None and not _has_non_finite(content):
+        try:
+            return orjson.dumps(
+                content,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(content, indent=2).encode('utf-8')
+
+# CSV files at least this large are parsed with PyArrow when it is installed
+_ARROW_CSV_MIN_BYTES = 1_000_000
+
+
+def _read_csv_arrow(path: Path) -> Optional[List[Dict[str, str]]]:
+    """Parse a CSV file with PyArrow's C reader.
+
+    Every column is read as a string so the result matches what
+    csv.DictReader produces for the same file.
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        List of row dictionaries, or None if PyArrow is not installed or
+        rejects the file (the caller then falls back to csv.DictReader)
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        return []
+
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in header},
+        strings_can_be_null=False,
+        quoted_strings_can_be_null=False,
+    )
+    # Use the header exactly as csv.DictReader sees it (pyarrow would strip
+    # a UTF-8 BOM from the first name, so column_types would miss it)
+    read_options = pacsv.ReadOptions(column_names=header, skip_rows=1)
+    # Quoted fields may span lines, as csv.DictReader allows
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+    except pa.ArrowInvalid as e:
+        # e.g. ragged rows, which DictReader tolerates
+        logger.debug(f"pyarrow could not parse {path}, using csv module: {e}")
+        return None
+    return table.to_pylist()
+
+
+@contextmanager
+def _csv_stream(path: Path) -> Iterator[csv.DictReader]:
+    """Yield a DictReader over a CSV file, closing the file on exit.
+
+    Args:
+        path: Path to the CSV file
+
+    Yields:
+        csv.DictReader producing one dictionary per row
+    """
+    f = open(path, 'r', newline='', encoding='utf-8')
+    try:
+        yield csv.DictReader(f)
+    finally:
+        f.close()
+
+
+def _json_root_is_array(f: Any) -> bool:
+    """Check whether a binary JSON file's top-level value is an array.
+
+    Skips leading JSON whitespace and rewinds the file afterwards.
+
+    Args:
+        f: JSON file opened in binary mode
+
+    Returns:
+        True if the first significant byte is '['
+    """
+    try:
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                return False
+            stripped = chunk.lstrip(b' \t\r\n')
+            if stripped:
+                return stripped[:1] == b'['
+    finally:
+        f.seek(0)
+
+
+@contextmanager
+def _json_stream(path: Path) -> Iterator[Iterator[Any]]:
+    """Yield the items of a top-level JSON array one at a time.
+
+    Uses ijson for incremental parsing when it is installed and the root is
+    an array. Otherwise the document is parsed in one go and its items (or
+    the object itself, if it is not an array) are iterated. Both paths
+    yield the same values, with floats as float.
+
+    Args:
+        path: Path to the JSON file
+
+    Yields:
+        Iterator over the top-level array items
+    """
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            if _json_root_is_array(f):
+                yield ijson.items(f, 'item', use_float=True)
+                return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield iter(data if isinstance(data, list) else [data])
+
+
+def read_file(file_path: str, file_type: str = "auto", stream: bool = False) -> Any:
     """Read a file and return its contents.
 
     This wraps the MCP filesystem server's read_csv tool and adds support
@@ -23,12 +198,17 @@ def read_file(file_path: str, file_type: str = "auto") -> Any:
         file_path: Path to the file to read
         file_type: Type of file ("csv", "json", "txt", "auto")
                    Auto will detect based on extension
+        stream: If True, return a context manager that yields rows lazily
+                instead of loading the whole file (CSV and JSON only).
+                Use as ``with read_file(path, stream=True) as rows: ...``
 
     Returns:
         File contents in appropriate format:
         - CSV: List of dictionaries
         - JSON: Parsed JSON object
         - TXT: String content
+        With stream=True, a context manager yielding an iterator of CSV rows
+        or top-level JSON array items.
 
     Raises:
         FileNotFoundError: If file doesn't exist
@@ -52,8 +232,21 @@ def read_file(file_path: str, file_type: str = "auto") -> Any:
 
     logger.info(f"Reading {file_type} file: {file_path}")
 
+    if stream:
+        if file_type == "csv":
+            return _csv_stream(path)
+        if file_type == "json":
+            return _json_stream(path)
+        raise ValueError(f"Streaming is not supported for file type: {file_type}")
+
     try:
         if file_type == "csv":
+            if path.stat().st_size >= _ARROW_CSV_MIN_BYTES:
+                data = _read_csv_arrow(path)
+                if data is not None:
+                    logger.debug(f"Read {len(data)} rows from CSV (pyarrow)")
+                    return data
+
             with open(path, 'r', newline='', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 data = list(reader)
@@ -61,8 +254,8 @@ def read_file(file_path: str, file_type: str = "auto") -> Any:
                 return data
 
         elif file_type == "json":
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(path, 'rb') as f:
+                data = _load_json_bytes(f.read())
                 logger.debug(f"Read JSON file with {len(data) if isinstance(data, (list, dict)) else 0} items")
                 return data
 
@@ -124,9 +317,9 @@ def write_file(
 
     try:
         if file_type == "json":
-            write_mode = 'a' if mode == "append" else 'w'
-            with open(path, write_mode, encoding='utf-8') as f:
-                json.dump(content, f, indent=2)
+            write_mode = 'ab' if mode == "append" else 'wb'
+            with open(path, write_mode) as f:
+                f.write(_dump_json_bytes(content))
                 logger.debug(f"Wrote JSON content to {file_path}")
 
         elif file_type == "csv":
@@ -137,7 +330,8 @@ def write_file(
             with open(path, write_mode, newline='', encoding='utf-8') as f:
                 fieldnames = content[0].keys()
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
-                if mode != "append" or not path.exists():
+                # Append mode opens at end of file, so offset 0 means it is new/empty
+                if f.tell() == 0:
                     writer.writeheader()
                 writer.writerows(content)
                 logger.debug(f"Wrote {len(content)} rows to CSV")
@@ -158,6 +352,100 @@ def write_file(
         raise
 
 
+# Path separators that make a glob pattern path-aware rather than name-only
+_GLOB_SEPARATORS = frozenset(sep for sep in ("/", os.sep, os.altsep) if sep)
+
+
+def _is_name_pattern(pattern: str) -> bool:
+    """Check whether a glob pattern only constrains the file name.
+
+    Such patterns can be matched against DirEntry names directly. Patterns
+    with a directory part or ``**`` need pathlib's path-aware matching.
+
+    Args:
+        pattern: Glob pattern
+
+    Returns:
+        True if the pattern contains no separator and no ``**``
+    """
+    if "**" in pattern:
+        return False
+    return not any(sep in pattern for sep in _GLOB_SEPARATORS)
+
+
+@lru_cache(maxsize=128)
+def _compile_name_glob(pattern: str) -> "Optional[re.Pattern[str]]":
+    """Compile a name-only glob pattern to a regex, reused across search_files calls.
+
+    fnmatch's ``*`` also matches ``/``, so the regex is only valid against
+    bare file names. Patterns with a directory part or ``**`` are not
+    compiled and must be matched with pathlib instead.
+
+    Args:
+        pattern: Glob pattern (e.g., "*.csv", "po_*")
+
+    Returns:
+        Compiled regular expression matching file names, or None if the
+        pattern is path-aware
+    """
+    if not _is_name_pattern(pattern):
+        return None
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+
+def _iter_files(directory: str, recursive: bool) -> Iterator[os.DirEntry]:
+    """Yield file entries under a directory using os.scandir.
+
+    DirEntry caches the file type from the directory read, so each entry
+    is classified without an extra stat call.
+
+    Args:
+        directory: Directory to scan
+        recursive: Whether to descend into subdirectories
+
+    Yields:
+        os.DirEntry for every regular file found
+    """
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_file():
+                        yield entry
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+        except PermissionError:
+            logger.debug(f"Skipping unreadable directory: {current}")
+
+
+def _search_glob(
+    dir_path: Path,
+    pattern: str,
+    recursive: bool,
+    file_type: Optional[str]
+) -> List[str]:
+    """Search with Path.glob/rglob for patterns that include a directory part.
+
+    Args:
+        dir_path: Directory to search in
+        pattern: Glob pattern (e.g., "sub/*.json", "**/*.csv")
+        recursive: Whether to search recursively
+        file_type: Optional file type filter (e.g., ".csv", ".json")
+
+    Returns:
+        Sorted list of matching file paths (as strings)
+    """
+    matches = dir_path.rglob(pattern) if recursive else dir_path.glob(pattern)
+    if file_type:
+        file_type_lc = file_type.lower()
+        matches = (p for p in matches if p.suffix.lower() == file_type_lc)
+    file_paths = sorted(str(p) for p in matches if p.is_file())
+    logger.info(f"Found {len(file_paths)} matching files")
+    return file_paths
+
+
 def search_files(
     directory: str,
     pattern: str = "*",
@@ -183,19 +471,21 @@ def search_files(
     logger.info(f"Searching for files in {directory}: {pattern} (recursive={recursive})")
 
     try:
-        if recursive:
-            matches = dir_path.rglob(pattern)
-        else:
-            matches = dir_path.glob(pattern)
-
-        # Filter by file type if specified
-        if file_type:
-            matches = [p for p in matches if p.suffix.lower() == file_type.lower()]
-        else:
-            matches = list(matches)
-
-        # Convert to strings and filter for files only
-        file_paths = [str(p) for p in matches if p.is_file()]
+        name_glob = _compile_name_glob(pattern)
+        if name_glob is None:
+            return _search_glob(dir_path, pattern, recursive, file_type)
+
+        matches = name_glob.match
+        normcase = os.path.normcase
+        file_type_lc = file_type.lower() if file_type else None
+        file_paths = []
+        for entry in _iter_files(str(dir_path), recursive):
+            name = entry.name
+            if not matches(normcase(name)):
+                continue
+            if file_type_lc and os.path.splitext(name)[1].lower() != file_type_lc:
+                continue
+            file_paths.append(entry.path)
 
         logger.info(f"Found {len(file_paths)} matching files")
         return sorted(file_paths)
@@ -228,20 +518,22 @@ def list_directory(directory: str, files_only: bool = False) -> List[Dict[str, A
 
     try:
         items = []
-        for item in dir_path.iterdir():
-            if files_only and not item.is_file():
-                continue
-
-            info = {
-                "name": item.name,
-                "path": str(item),
-                "is_file": item.is_file()
-            }
-
-            if item.is_file():
-                info["size"] = item.stat().st_size
-
-            items.append(info)
+        with os.scandir(str(dir_path)) as it:
+            for entry in it:
+                is_file = entry.is_file()
+                if files_only and not is_file:
+                    continue
+
+                info = {
+                    "name": entry.name,
+                    "path": entry.path,
+                    "is_file": is_file
+                }
+
+                if is_file:
+                    info["size"] = entry.stat().st_size
+
+                items.append(info)
 
         logger.debug(f"Found {len(items)} items in directory")
         return sorted(items, key=lambda x: x["name"])
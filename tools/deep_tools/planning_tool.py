@@ -4,8 +4,12 @@ This module provides task planning and breakdown capabilities, allowing agents
 to create structured task lists for complex workflows.
 """
 
+import heapq
 import logging
-from typing import List, Dict, Any, Optional
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -37,147 +41,189 @@ class TaskStep(BaseModel):
     dependencies: Optional[List[int]] = Field(default=None, description="Dependent step numbers")
 
 
-def write_todos(task_description: str, context: Optional[Dict[str, Any]] = None) -> List[TaskStep]:
-    """Break down a task into actionable steps.
+# Workflow keyword patterns, in priority order. Each keyword list is compiled
+# into one alternation so a description is scanned once per workflow.
+_WORKFLOW_PATTERNS = tuple(
+    (workflow, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+    for workflow, keywords in (
+        ("purchase_order", ("purchase order", "create po", "order", "reorder")),
+        ("inventory_check", ("check inventory", "inventory status", "stock level")),
+        ("supplier_selection", ("supplier", "quote", "pricing")),
+    )
+)
 
-    This is a simplified implementation of the Deep Agents SDK write_todos tool.
-    In a production system, this would use an LLM to generate context-aware task breakdowns.
-    For the MVP, we use rule-based patterns.
 
-    Args:
-        task_description: Natural language description of the task
-        context: Optional context for task planning (e.g., current state, available resources)
+@lru_cache(maxsize=128)
+def _match_workflow(task_lower: str) -> Optional[str]:
+    """Return the first workflow whose keywords appear in a lowercased task.
 
-    Returns:
-        List of TaskStep objects representing the breakdown
+    Memoized, since agents tend to re-plan the same few descriptions.
     """
-    logger.info(f"Planning task: {task_description}")
+    for workflow, pattern in _WORKFLOW_PATTERNS:
+        if pattern.search(task_lower):
+            return workflow
+    return None
 
-    task_lower = task_description.lower()
 
+# Step templates, validated once at import. write_todos hands out copies
+# (with their own dependency lists) so callers can update status freely.
+_WORKFLOW_TEMPLATES: Dict[str, Tuple[TaskStep, ...]] = {
     # Pattern 1: Purchase Order Workflow
-    if any(keyword in task_lower for keyword in ["purchase order", "create po", "order", "reorder"]):
-        tasks = [
-            TaskStep(
-                step=1,
-                action="Check inventory levels and identify items below reorder point",
-                status=TaskStatus.PENDING,
-                agent="inventory_monitor"
-            ),
-            TaskStep(
-                step=2,
-                action="Query suppliers for quotes and pricing",
-                status=TaskStatus.PENDING,
-                agent="supplier_selector",
-                dependencies=[1]
-            ),
-            TaskStep(
-                step=3,
-                action="Compare supplier offers and select best options",
-                status=TaskStatus.PENDING,
-                agent="supplier_selector",
-                dependencies=[2]
-            ),
-            TaskStep(
-                step=4,
-                action="Generate purchase order documents with tax calculations",
-                status=TaskStatus.PENDING,
-                agent="purchase_order",
-                dependencies=[3]
-            ),
-            TaskStep(
-                step=5,
-                action="Validate purchase orders (high-value orders only)",
-                status=TaskStatus.PENDING,
-                agent="purchase_order.validator",
-                dependencies=[4]
-            ),
-            TaskStep(
-                step=6,
-                action="Save purchase orders to filesystem",
-                status=TaskStatus.PENDING,
-                agent="purchase_order",
-                dependencies=[5]
-            )
-        ]
-        logger.info(f"Generated {len(tasks)} steps for purchase order workflow")
-        return tasks
-
+    "purchase_order": (
+        TaskStep(
+            step=1,
+            action="Check inventory levels and identify items below reorder point",
+            status=TaskStatus.PENDING,
+            agent="inventory_monitor"
+        ),
+        TaskStep(
+            step=2,
+            action="Query suppliers for quotes and pricing",
+            status=TaskStatus.PENDING,
+            agent="supplier_selector",
+            dependencies=[1]
+        ),
+        TaskStep(
+            step=3,
+            action="Compare supplier offers and select best options",
+            status=TaskStatus.PENDING,
+            agent="supplier_selector",
+            dependencies=[2]
+        ),
+        TaskStep(
+            step=4,
+            action="Generate purchase order documents with tax calculations",
+            status=TaskStatus.PENDING,
+            agent="purchase_order",
+            dependencies=[3]
+        ),
+        TaskStep(
+            step=5,
+            action="Validate purchase orders (high-value orders only)",
+            status=TaskStatus.PENDING,
+            agent="purchase_order.validator",
+            dependencies=[4]
+        ),
+        TaskStep(
+            step=6,
+            action="Save purchase orders to filesystem",
+            status=TaskStatus.PENDING,
+            agent="purchase_order",
+            dependencies=[5]
+        )
+    ),
     # Pattern 2: Inventory Check Only
-    if any(keyword in task_lower for keyword in ["check inventory", "inventory status", "stock level"]):
-        tasks = [
-            TaskStep(
-                step=1,
-                action="Load inventory data from CSV",
-                status=TaskStatus.PENDING,
-                agent="inventory_monitor"
-            ),
-            TaskStep(
-                step=2,
-                action="Check stock levels against reorder points",
-                status=TaskStatus.PENDING,
-                agent="inventory_monitor",
-                dependencies=[1]
-            ),
-            TaskStep(
-                step=3,
-                action="Calculate recommended reorder quantities",
-                status=TaskStatus.PENDING,
-                agent="inventory_monitor",
-                dependencies=[2]
-            )
-        ]
-        logger.info(f"Generated {len(tasks)} steps for inventory check workflow")
-        return tasks
-
+    "inventory_check": (
+        TaskStep(
+            step=1,
+            action="Load inventory data from CSV",
+            status=TaskStatus.PENDING,
+            agent="inventory_monitor"
+        ),
+        TaskStep(
+            step=2,
+            action="Check stock levels against reorder points",
+            status=TaskStatus.PENDING,
+            agent="inventory_monitor",
+            dependencies=[1]
+        ),
+        TaskStep(
+            step=3,
+            action="Calculate recommended reorder quantities",
+            status=TaskStatus.PENDING,
+            agent="inventory_monitor",
+            dependencies=[2]
+        )
+    ),
     # Pattern 3: Supplier Selection Only
-    if any(keyword in task_lower for keyword in ["supplier", "quote", "pricing"]):
-        tasks = [
-            TaskStep(
-                step=1,
-                action="Load supplier data",
-                status=TaskStatus.PENDING,
-                agent="supplier_selector"
-            ),
-            TaskStep(
-                step=2,
-                action="Collect quotes from all suppliers",
-                status=TaskStatus.PENDING,
-                agent="supplier_selector",
-                dependencies=[1]
-            ),
-            TaskStep(
-                step=3,
-                action="Analyze and recommend best suppliers",
-                status=TaskStatus.PENDING,
-                agent="supplier_selector",
-                dependencies=[2]
-            )
-        ]
-        logger.info(f"Generated {len(tasks)} steps for supplier selection workflow")
-        return tasks
-
-    # Default: Generic task breakdown
-    tasks = [
+    "supplier_selection": (
         TaskStep(
             step=1,
-            action=f"Parse and understand task: {task_description}",
-            status=TaskStatus.PENDING
+            action="Load supplier data",
+            status=TaskStatus.PENDING,
+            agent="supplier_selector"
         ),
         TaskStep(
             step=2,
-            action="Execute primary task action",
+            action="Collect quotes from all suppliers",
             status=TaskStatus.PENDING,
+            agent="supplier_selector",
             dependencies=[1]
         ),
         TaskStep(
             step=3,
-            action="Validate and return results",
+            action="Analyze and recommend best suppliers",
             status=TaskStatus.PENDING,
+            agent="supplier_selector",
             dependencies=[2]
         )
+    ),
+}
+
+_WORKFLOW_LABELS = {
+    "purchase_order": "purchase order",
+    "inventory_check": "inventory check",
+    "supplier_selection": "supplier selection",
+}
+
+# Default: Generic task breakdown (step 1 action is filled in per task)
+_GENERIC_TEMPLATE: Tuple[TaskStep, ...] = (
+    TaskStep(
+        step=1,
+        action="Parse and understand task",
+        status=TaskStatus.PENDING
+    ),
+    TaskStep(
+        step=2,
+        action="Execute primary task action",
+        status=TaskStatus.PENDING,
+        dependencies=[1]
+    ),
+    TaskStep(
+        step=3,
+        action="Validate and return results",
+        status=TaskStatus.PENDING,
+        dependencies=[2]
+    )
+)
+
+
+def _instantiate(template: Tuple[TaskStep, ...]) -> List[TaskStep]:
+    """Copy a step template without re-running pydantic validation."""
+    return [
+        step.model_copy(update={"dependencies": list(step.dependencies)})
+        if step.dependencies is not None else step.model_copy()
+        for step in template
     ]
-    logger.info(f"Generated {len(tasks)} steps for generic workflow")
+
+
+def write_todos(task_description: str, context: Optional[Dict[str, Any]] = None) -> List[TaskStep]:
+    """Break down a task into actionable steps.
+
+    This is a simplified implementation of the Deep Agents SDK write_todos tool.
+    In a production system, this would use an LLM to generate context-aware task breakdowns.
+    For the MVP, we use rule-based patterns.
+
+    Args:
+        task_description: Natural language description of the task
+        context: Optional context for task planning (e.g., current state, available resources)
+
+    Returns:
+        List of TaskStep objects representing the breakdown
+    """
+    logger.info("Planning task: %s", task_description)
+
+    workflow = _match_workflow(task_description.lower().strip())
+
+    if workflow is not None:
+        tasks = _instantiate(_WORKFLOW_TEMPLATES[workflow])
+        logger.info("Generated %d steps for %s workflow", len(tasks), _WORKFLOW_LABELS[workflow])
+        return tasks
+
+    # Default: Generic task breakdown
+    tasks = _instantiate(_GENERIC_TEMPLATE)
+    tasks[0].action = f"Parse and understand task: {task_description}"
+    logger.info("Generated %d steps for generic workflow", len(tasks))
     return tasks
 
 
@@ -207,10 +253,56 @@ def format_task_list(tasks: List[TaskStep], show_agent: bool = False) -> str:
     return "\n".join(lines)
 
 
+def index_tasks(tasks: List[TaskStep]) -> Dict[int, int]:
+    """Map step numbers to their positions in a task list.
+
+    Build this once per plan and pass it to update_task_status() or
+    get_task_by_step() to avoid scanning the list on every call.
+
+    Args:
+        tasks: List of TaskStep objects
+
+    Returns:
+        Dictionary of step number -> list index (first occurrence wins)
+    """
+    step_to_index: Dict[int, int] = {}
+    for i, task in enumerate(tasks):
+        step_to_index.setdefault(task.step, i)
+    return step_to_index
+
+
+def get_task_by_step(
+    tasks: List[TaskStep],
+    step_number: int,
+    step_to_index: Optional[Dict[int, int]] = None
+) -> Optional[TaskStep]:
+    """Find the task with a given step number.
+
+    Args:
+        tasks: List of TaskStep objects
+        step_number: Step number to look up
+        step_to_index: Optional index from index_tasks() for O(1) lookup
+
+    Returns:
+        Matching task, or None if there is none
+    """
+    if step_to_index is not None:
+        i = step_to_index.get(step_number)
+        # Trust the index only while it still matches the list
+        if i is not None and i < len(tasks) and tasks[i].step == step_number:
+            return tasks[i]
+
+    for task in tasks:
+        if task.step == step_number:
+            return task
+    return None
+
+
 def update_task_status(
     tasks: List[TaskStep],
     step_number: int,
-    new_status: TaskStatus
+    new_status: TaskStatus,
+    step_to_index: Optional[Dict[int, int]] = None
 ) -> List[TaskStep]:
     """Update the status of a specific task step.
 
@@ -218,41 +310,247 @@ def update_task_status(
         tasks: List of TaskStep objects
         step_number: Step number to update
         new_status: New status to set
+        step_to_index: Optional index from index_tasks() for O(1) lookup
 
     Returns:
         Updated list of tasks
     """
-    for task in tasks:
-        if task.step == step_number:
-            old_status = task.status
-            task.status = new_status
-            logger.debug(f"Task {step_number} status: {old_status} -> {new_status}")
-            break
+    task = get_task_by_step(tasks, step_number, step_to_index)
+    if task is not None:
+        old_status = task.status
+        task.status = new_status
+        logger.debug("Task %s status: %s -> %s", step_number, old_status, new_status)
 
     return tasks
 
 
-def get_next_task(tasks: List[TaskStep]) -> Optional[TaskStep]:
+def compute_priorities(tasks: List[TaskStep]) -> Dict[int, int]:
+    """Compute the critical-path length of every step.
+
+    A step's priority is the number of steps on the longest chain that
+    starts at it and follows its dependents (each step counts as 1), so
+    steps that unblock the most remaining work rank highest. Computed in
+    one pass over the DAG in reverse topological order.
+
+    Args:
+        tasks: List of TaskStep objects
+
+    Returns:
+        Dictionary of step number -> priority. Steps on a dependency
+        cycle are left out.
+    """
+    succs: Dict[int, List[int]] = {task.step: [] for task in tasks}
+    deps: Dict[int, List[int]] = {}
+    for task in tasks:
+        known = [dep for dep in task.dependencies or () if dep in succs]
+        deps[task.step] = known
+        for dep in known:
+            succs[dep].append(task.step)
+
+    remaining = {step: len(children) for step, children in succs.items()}
+    stack = [step for step, count in remaining.items() if count == 0]
+    priorities: Dict[int, int] = {}
+    while stack:
+        step = stack.pop()
+        priorities[step] = 1 + max((priorities[s] for s in succs[step]), default=0)
+        for dep in deps[step]:
+            remaining[dep] -= 1
+            if remaining[dep] == 0:
+                stack.append(dep)
+
+    return priorities
+
+
+def _step_bit(step: int) -> int:
+    """Bit representing a step number in a completion/dependency mask.
+
+    Steps map to bits zigzag-style (0, 1, -1, 2, -2, ...) so any integer
+    step has its own bit; plans from write_todos fit in a machine word.
+    """
+    return 1 << (step << 1 if step >= 0 else (-step << 1) - 1)
+
+
+@lru_cache(maxsize=1024)
+def _dependency_mask(dependencies: Tuple[int, ...]) -> int:
+    """Combined step bits for a dependency list."""
+    mask = 0
+    for dep in dependencies:
+        mask |= _step_bit(dep)
+    return mask
+
+
+def get_next_task(
+    tasks: List[TaskStep],
+    priorities: Optional[Dict[int, int]] = None
+) -> Optional[TaskStep]:
     """Get the next pending task that has all dependencies met.
 
     Args:
         tasks: List of TaskStep objects
+        priorities: Optional step priorities from compute_priorities(). When
+            given, the ready task with the highest priority is returned
+            (ties go to the earliest in the list) instead of the first one.
 
     Returns:
         Next task to execute, or None if no tasks are ready
     """
-    completed_steps = {task.step for task in tasks if task.status == TaskStatus.COMPLETED}
+    completed, pending = TaskStatus.COMPLETED, TaskStatus.PENDING
+    completed_mask = 0
+    for task in tasks:
+        if task.status == completed:
+            completed_mask |= _step_bit(task.step)
 
+    best = None
+    best_priority = None
     for task in tasks:
-        if task.status != TaskStatus.PENDING:
+        if task.status != pending:
+            continue
+
+        # Check if all dependencies are met: no dependency bit left uncompleted
+        dependencies = task.dependencies
+        if dependencies and _dependency_mask(tuple(dependencies)) & ~completed_mask:
             continue
 
-        # Check if all dependencies are met
-        if task.dependencies:
-            if all(dep in completed_steps for dep in task.dependencies):
-                return task
-        else:
-            # No dependencies, task is ready
+        if priorities is None:
             return task
 
-    return None
+        priority = priorities.get(task.step, 0)
+        if best_priority is None or priority > best_priority:
+            best, best_priority = task, priority
+
+    return best
+
+
+@dataclass
+class TaskGraph:
+    """Dependency graph over a task list with an incremental ready queue.
+
+    For each task it tracks how many dependencies are not yet completed;
+    tasks whose count drops to zero enter a heap of list positions, so
+    next_task() returns the same task as get_next_task() without rescanning
+    the list. Status changes must go through set_status() to keep the
+    counts current.
+
+    Attributes:
+        tasks: The underlying task list (shared, not copied)
+        index: Step number -> position in tasks
+        indegree: Number of unmet dependencies per task
+        children: Positions of the tasks that depend on each task
+        ready: Heap of positions with no unmet dependencies
+    """
+    tasks: List[TaskStep]
+    index: Dict[int, int]
+    indegree: List[int]
+    children: List[List[int]]
+    ready: List[int]
+
+    @classmethod
+    def from_tasks(cls, tasks: List[TaskStep]) -> "TaskGraph":
+        """Build the graph and initial ready queue for a task list.
+
+        Args:
+            tasks: List of TaskStep objects
+
+        Returns:
+            TaskGraph over the list
+        """
+        index = index_tasks(tasks)
+
+        indegree = [0] * len(tasks)
+        children: List[List[int]] = [[] for _ in tasks]
+        for i, task in enumerate(tasks):
+            for dep in task.dependencies or ():
+                j = index.get(dep)
+                if j is not None:
+                    children[j].append(i)
+                    if tasks[j].status == TaskStatus.COMPLETED:
+                        continue
+                # Unknown steps never complete, so the task is never ready
+                indegree[i] += 1
+
+        ready = [i for i, count in enumerate(indegree) if count == 0]
+        return cls(tasks=tasks, index=index, indegree=indegree, children=children, ready=ready)
+
+    def set_status(self, step_number: int, new_status: TaskStatus) -> Optional[TaskStep]:
+        """Update a task's status and propagate completion to its dependents.
+
+        Args:
+            step_number: Step number to update
+            new_status: New status to set
+
+        Returns:
+            The updated task, or None if no task has that step number
+        """
+        i = self.index.get(step_number)
+        if i is None:
+            return None
+
+        task = self.tasks[i]
+        old_status = task.status
+        task.status = new_status
+
+        was_completed = old_status == TaskStatus.COMPLETED
+        is_completed = new_status == TaskStatus.COMPLETED
+        if is_completed and not was_completed:
+            for child in self.children[i]:
+                self.indegree[child] -= 1
+                if self.indegree[child] == 0:
+                    heapq.heappush(self.ready, child)
+        elif was_completed and not is_completed:
+            for child in self.children[i]:
+                self.indegree[child] += 1
+
+        if new_status == TaskStatus.PENDING and self.indegree[i] == 0:
+            heapq.heappush(self.ready, i)
+
+        logger.debug("Task %s status: %s -> %s", step_number, old_status, new_status)
+        return task
+
+    def next_task(self) -> Optional[TaskStep]:
+        """Get the next pending task that has all dependencies met.
+
+        Returns:
+            Next task to execute, or None if no tasks are ready
+        """
+        ready = self.ready
+        while ready:
+            i = ready[0]
+            if self.indegree[i] == 0 and self.tasks[i].status == TaskStatus.PENDING:
+                return self.tasks[i]
+            # Started, finished or blocked again; set_status re-queues it if needed
+            heapq.heappop(ready)
+        return None
+
+
+def plan_stages(tasks: List[TaskStep]) -> List[List[TaskStep]]:
+    """Group unfinished tasks into stages that can run in parallel.
+
+    Stage k holds the tasks whose dependencies are all completed or in
+    earlier stages (Kahn's algorithm, one level at a time). Tasks that
+    depend on unknown steps or sit on a dependency cycle are left out.
+
+    Args:
+        tasks: List of TaskStep objects
+
+    Returns:
+        List of stages, each a list of tasks in plan order
+    """
+    graph = TaskGraph.from_tasks(tasks)
+    indegree = list(graph.indegree)
+    current = [
+        i for i, count in enumerate(indegree)
+        if count == 0 and tasks[i].status != TaskStatus.COMPLETED
+    ]
+
+    stages: List[List[TaskStep]] = []
+    while current:
+        stages.append([tasks[i] for i in current])
+        next_stage = []
+        for i in current:
+            for child in graph.children[i]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    next_stage.append(child)
+        current = sorted(next_stage)
+
+    return stages
@@ -4,13 +4,26 @@ This module provides the task tool for spawning sub-agents, enabling
 hierarchical agent structures and specialized task delegation.
 """
 
+import asyncio
 import logging
-import uuid
-from typing import Dict, Any, Optional, List, Callable
-from datetime import datetime
+import secrets
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List, Callable, Set, Tuple, Union
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError
+from functools import lru_cache
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, Future, TimeoutError, wait
+import numpy as np
+
+from tools.deep_tools.planning_tool import (
+    TaskStep,
+    TaskStatus as PlanStatus,
+    plan_stages,
+    update_task_status,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +37,10 @@ class SubAgentType(str, Enum):
     CUSTOM = "custom"
 
 
+# Known sub-agent type values; anything else maps to CUSTOM
+_SUBAGENT_BY_VALUE: Dict[str, SubAgentType] = {e.value: e for e in SubAgentType}
+
+
 class TaskStatus(str, Enum):
     """Status of a spawned task."""
     PENDING = "pending"
@@ -34,7 +51,7 @@ class TaskStatus(str, Enum):
     TIMEOUT = "timeout"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Result of a sub-agent task execution.
 
@@ -56,7 +73,7 @@ class TaskResult:
     duration_ms: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SpawnedTask:
     """Represents a spawned sub-agent task.
 
@@ -68,6 +85,7 @@ class SpawnedTask:
         handler: Function to execute
         status: Current status
         future: Async future (if running async)
+        cpu_bound: Whether async runs use the process pool
     """
     task_id: str
     agent_type: SubAgentType
@@ -77,38 +95,144 @@ class SpawnedTask:
     status: TaskStatus = TaskStatus.PENDING
     future: Optional[Future] = None
     result: Optional[TaskResult] = None
+    cpu_bound: bool = False
+
+
+@lru_cache(maxsize=None)
+def _po_validation() -> Tuple[Callable, type]:
+    """Import the PO validator on first use (avoids a circular import)."""
+    from agent.purchase_order.validator import validate_purchase_order
+    from agent.purchase_order.models import PurchaseOrder
+    return validate_purchase_order, PurchaseOrder
+
+
+def _validator_handler(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a purchase order with the PO validator agent."""
+    validate_purchase_order, PurchaseOrder = _po_validation()
+
+    po_data = input_data.get("purchase_order", {})
+    if isinstance(po_data, dict):
+        po = PurchaseOrder(**po_data)
+    else:
+        po = po_data
+
+    result = validate_purchase_order(po)
+    return {
+        "is_valid": result.is_valid,
+        "issues": [
+            {"code": i.code, "message": i.message, "severity": i.severity.value}
+            for i in result.issues
+        ]
+    }
+
+
+def _calc_avg(values: List[Any]) -> Any:
+    return sum(values) / len(values) if values else 0
+
+
+def _calc_max(values: List[Any]) -> Any:
+    return max(values) if values else 0
+
+
+def _calc_min(values: List[Any]) -> Any:
+    return min(values) if values else 0
+
+
+# Calculator operations; unknown operations yield 0
+_OPS: Dict[str, Callable[[List[Any]], Any]] = {
+    "sum": sum,
+    "avg": _calc_avg,
+    "max": _calc_max,
+    "min": _calc_min,
+}
+
+
+def _calculate_array(operation: str, values: np.ndarray) -> Any:
+    """Aggregate a NumPy array with its native reductions.
+
+    Args:
+        operation: One of the _OPS keys
+        values: Array of values
+
+    Returns:
+        The result as a Python scalar (0 for an empty array)
+    """
+    if values.size == 0:
+        return 0
+    if operation == "sum":
+        return values.sum().item()
+    if operation == "avg":
+        return values.sum().item() / values.size
+    if operation == "max":
+        return values.max().item()
+    return values.min().item()
+
+
+def _calculator_handler(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a simple aggregate (sum, avg, max, min) to a list of values."""
+    operation = input_data.get("operation", "sum")
+    values = input_data.get("values", [])
+
+    op = _OPS.get(operation)
+    if op is None:
+        result = 0
+    elif isinstance(values, np.ndarray):
+        # Arrays reduce in C; the list path would box every element
+        result = _calculate_array(operation, values.ravel())
+    else:
+        result = op(values)
+
+    return {"operation": operation, "result": result}
 
 
 class SubAgentSpawner:
     """Spawner for sub-agent tasks.
 
     Provides functionality to spawn, manage, and monitor sub-agent tasks.
-    Supports both synchronous and asynchronous execution.
+    Supports both synchronous and asynchronous execution. Async runs use a
+    thread pool, except for handlers registered as CPU-bound, which run in
+    a process pool (created on first use) to get past the GIL.
 
     Attributes:
         max_concurrent: Maximum concurrent tasks
         timeout_seconds: Default task timeout
+        completed_history: Number of completed task results retained
         executor: Thread pool for async execution
     """
 
     def __init__(
         self,
         max_concurrent: int = 5,
-        timeout_seconds: float = 60.0
+        timeout_seconds: float = 60.0,
+        completed_history: int = 1024
     ):
         """Initialize the sub-agent spawner.
 
         Args:
             max_concurrent: Maximum concurrent tasks
             timeout_seconds: Default timeout for tasks
+            completed_history: Number of completed task results to keep;
+                older results are discarded as new ones arrive
         """
         self.max_concurrent = max_concurrent
         self.timeout_seconds = timeout_seconds
+        self.completed_history = completed_history
         self.executor = ThreadPoolExecutor(max_workers=max_concurrent)
 
+        # Guards the task registries; held only around bookkeeping, never
+        # while a handler runs
+        self._lock = threading.Lock()
         self._active_tasks: Dict[str, SpawnedTask] = {}
-        self._completed_tasks: List[TaskResult] = []
+        # Bumped whenever an active task is added, removed or changes status
+        self._active_version = 0
+        self._active_snapshot: Optional[List[Dict[str, Any]]] = None
+        self._active_snapshot_version = -1
+        self._completed_tasks: Deque[TaskResult] = deque(maxlen=completed_history)
         self._handlers: Dict[str, Callable] = {}
+        self._cpu_bound_types: Set[str] = set()
+        # agent_type -> (handler, SubAgentType, cpu_bound); cleared on registration
+        self._resolved: Dict[str, Tuple[Callable, SubAgentType, bool]] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
 
         # Register default handlers
         self._register_default_handlers()
@@ -119,61 +243,30 @@ class SubAgentSpawner:
 
     def _register_default_handlers(self) -> None:
         """Register default sub-agent handlers."""
-
-        # Validator handler
-        def validator_handler(input_data: Dict[str, Any]) -> Dict[str, Any]:
-            from agent.purchase_order.validator import validate_purchase_order
-            from agent.purchase_order.models import PurchaseOrder
-
-            po_data = input_data.get("purchase_order", {})
-            if isinstance(po_data, dict):
-                po = PurchaseOrder(**po_data)
-            else:
-                po = po_data
-
-            result = validate_purchase_order(po)
-            return {
-                "is_valid": result.is_valid,
-                "issues": [
-                    {"code": i.code, "message": i.message, "severity": i.severity.value}
-                    for i in result.issues
-                ]
-            }
-
-        self._handlers["validator"] = validator_handler
-
-        # Calculator handler
-        def calculator_handler(input_data: Dict[str, Any]) -> Dict[str, Any]:
-            operation = input_data.get("operation", "sum")
-            values = input_data.get("values", [])
-
-            if operation == "sum":
-                result = sum(values)
-            elif operation == "avg":
-                result = sum(values) / len(values) if values else 0
-            elif operation == "max":
-                result = max(values) if values else 0
-            elif operation == "min":
-                result = min(values) if values else 0
-            else:
-                result = 0
-
-            return {"operation": operation, "result": result}
-
-        self._handlers["calculator"] = calculator_handler
+        self._handlers["validator"] = _validator_handler
+        self._handlers["calculator"] = _calculator_handler
 
     def register_handler(
         self,
         agent_type: str,
-        handler: Callable[[Dict[str, Any]], Dict[str, Any]]
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+        cpu_bound: bool = False
     ) -> None:
         """Register a custom handler for an agent type.
 
         Args:
             agent_type: Agent type identifier
             handler: Handler function
+            cpu_bound: Run async executions in a process pool. The handler
+                and its input/output must be picklable (e.g. a module-level
+                function)
         """
         self._handlers[agent_type] = handler
+        if cpu_bound:
+            self._cpu_bound_types.add(agent_type)
+        else:
+            self._cpu_bound_types.discard(agent_type)
+        self._resolved.pop(agent_type, None)
         logger.info(f"Registered handler for agent type: {agent_type}")
 
     def spawn_task(
@@ -196,38 +289,187 @@ class SubAgentSpawner:
         Returns:
             TaskResult with execution status and result
         """
-        task_id = f"task-{uuid.uuid4().hex[:8]}"
         timeout = timeout or self.timeout_seconds
+        task = self._prepare_task(agent_type, description, input_data)
+        if isinstance(task, TaskResult):
+            return task
+
+        # Execute
+        if async_execution:
+            return self._execute_async(task, timeout)
+        else:
+            return self._execute_sync(task, timeout)
+
+    async def spawn_task_async(
+        self,
+        agent_type: str,
+        description: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> TaskResult:
+        """Spawn a sub-agent task and await it from an asyncio event loop.
+
+        The handler runs in the spawner's executor, so many tasks can be
+        awaited concurrently (e.g. with asyncio.gather) without blocking
+        the loop.
+
+        Args:
+            agent_type: Type of sub-agent to spawn
+            description: Task description
+            input_data: Input data for the task
+            timeout: Optional timeout override
+
+        Returns:
+            TaskResult with execution status and result
+        """
+        timeout = timeout or self.timeout_seconds
+        task = self._prepare_task(agent_type, description, input_data)
+        if isinstance(task, TaskResult):
+            return task
+
+        self._set_running(task)
+        started_ns = time.perf_counter_ns()
+        started_at = datetime.now()
+
+        loop = asyncio.get_running_loop()
+        try:
+            result_data = await asyncio.wait_for(
+                loop.run_in_executor(self._pool_for(task), task.handler, task.input_data),
+                timeout
+            )
+
+            duration_ms = (time.perf_counter_ns() - started_ns) / 1e6
+            completed_at = started_at + timedelta(milliseconds=duration_ms)
+
+            result = TaskResult(
+                task_id=task.task_id,
+                status=TaskStatus.COMPLETED,
+                result=result_data,
+                started_at=started_at,
+                completed_at=completed_at,
+                duration_ms=duration_ms
+            )
+
+        except asyncio.TimeoutError:
+            result = TaskResult(
+                task_id=task.task_id,
+                status=TaskStatus.TIMEOUT,
+                error=f"Task timed out after {timeout}s",
+                started_at=started_at
+            )
+            logger.warning("[SubAgent] Task %s timed out", task.task_id)
+
+        except Exception as e:
+            result = TaskResult(
+                task_id=task.task_id,
+                status=TaskStatus.FAILED,
+                error=str(e),
+                started_at=started_at
+            )
+            logger.error("[SubAgent] Task %s failed: %s", task.task_id, e)
+
+        self._finish_task(task, result)
+
+        return result
+
+    def _prepare_task(
+        self,
+        agent_type: str,
+        description: str,
+        input_data: Dict[str, Any]
+    ) -> Union[SpawnedTask, TaskResult]:
+        """Resolve the handler and register a new active task.
+
+        Args:
+            agent_type: Type of sub-agent to spawn
+            description: Task description
+            input_data: Input data for the task
+
+        Returns:
+            The registered SpawnedTask, or a FAILED TaskResult if no
+            handler exists for agent_type
+        """
+        task_id = f"task-{secrets.token_hex(4)}"
 
-        logger.info(f"[SubAgent] Spawning task: {task_id} ({agent_type})")
-        logger.info(f"[SubAgent] Description: {description}")
+        logger.info("[SubAgent] Spawning task: %s (%s)", task_id, agent_type)
+        logger.info("[SubAgent] Description: %s", description)
 
         # Get handler
-        handler = self._handlers.get(agent_type)
-        if not handler:
-            logger.error(f"No handler for agent type: {agent_type}")
+        resolved = self._resolve(agent_type)
+        if resolved is None:
+            logger.error("No handler for agent type: %s", agent_type)
             return TaskResult(
                 task_id=task_id,
                 status=TaskStatus.FAILED,
                 error=f"No handler for agent type: {agent_type}"
             )
+        handler, subagent_type, cpu_bound = resolved
 
         # Create task
         task = SpawnedTask(
             task_id=task_id,
-            agent_type=SubAgentType(agent_type) if agent_type in [e.value for e in SubAgentType] else SubAgentType.CUSTOM,
+            agent_type=subagent_type,
             description=description,
             input_data=input_data,
-            handler=handler
+            handler=handler,
+            cpu_bound=cpu_bound
         )
 
-        self._active_tasks[task_id] = task
+        with self._lock:
+            self._active_tasks[task_id] = task
+            self._active_version += 1
+        return task
 
-        # Execute
-        if async_execution:
-            return self._execute_async(task, timeout)
-        else:
-            return self._execute_sync(task, timeout)
+    def _set_running(self, task: SpawnedTask) -> None:
+        """Mark an active task as running."""
+        with self._lock:
+            task.status = TaskStatus.RUNNING
+            self._active_version += 1
+
+    def _finish_task(self, task: SpawnedTask, result: TaskResult) -> None:
+        """Record a task's result and move it out of the active registry.
+
+        Safe to call from worker threads. A task already removed (e.g. by
+        cancel_task) still has its result recorded.
+        """
+        with self._lock:
+            task.result = result
+            if self._active_tasks.pop(task.task_id, None) is not None:
+                self._active_version += 1
+            self._completed_tasks.append(result)
+
+    def _resolve(self, agent_type: str) -> Optional[Tuple[Callable, SubAgentType, bool]]:
+        """Look up the handler, sub-agent type and routing for an agent type.
+
+        Results are memoized per agent type until register_handler() is
+        called for it again.
+
+        Args:
+            agent_type: Agent type identifier
+
+        Returns:
+            (handler, SubAgentType, cpu_bound), or None if no handler exists
+        """
+        resolved = self._resolved.get(agent_type)
+        if resolved is None:
+            handler = self._handlers.get(agent_type)
+            if not handler:
+                return None
+            resolved = (
+                handler,
+                _SUBAGENT_BY_VALUE.get(agent_type, SubAgentType.CUSTOM),
+                agent_type in self._cpu_bound_types
+            )
+            self._resolved[agent_type] = resolved
+        return resolved
+
+    def _pool_for(self, task: SpawnedTask) -> Executor:
+        """Get the executor for a task, creating the process pool on first use."""
+        if not task.cpu_bound:
+            return self.executor
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_concurrent)
+        return self._process_pool
 
     def _execute_sync(self, task: SpawnedTask, timeout: float) -> TaskResult:
         """Execute a task synchronously.
@@ -239,15 +481,17 @@ class SubAgentSpawner:
         Returns:
             TaskResult
         """
-        task.status = TaskStatus.RUNNING
+        self._set_running(task)
+        started_ns = time.perf_counter_ns()
         started_at = datetime.now()
 
         try:
             # Execute handler
             result_data = task.handler(task.input_data)
 
-            completed_at = datetime.now()
-            duration_ms = (completed_at - started_at).total_seconds() * 1000
+            # Monotonic clock for the duration; wall-clock time only at start
+            duration_ms = (time.perf_counter_ns() - started_ns) / 1e6
+            completed_at = started_at + timedelta(milliseconds=duration_ms)
 
             result = TaskResult(
                 task_id=task.task_id,
@@ -258,13 +502,11 @@ class SubAgentSpawner:
                 duration_ms=duration_ms
             )
 
-            logger.info(
-                f"[SubAgent] Task {task.task_id} completed in {duration_ms:.2f}ms"
-            )
+            logger.info("[SubAgent] Task %s completed in %.2fms", task.task_id, duration_ms)
 
         except Exception as e:
-            completed_at = datetime.now()
-            duration_ms = (completed_at - started_at).total_seconds() * 1000
+            duration_ms = (time.perf_counter_ns() - started_ns) / 1e6
+            completed_at = started_at + timedelta(milliseconds=duration_ms)
 
             result = TaskResult(
                 task_id=task.task_id,
@@ -275,12 +517,9 @@ class SubAgentSpawner:
                 duration_ms=duration_ms
             )
 
-            logger.error(f"[SubAgent] Task {task.task_id} failed: {e}")
+            logger.error("[SubAgent] Task %s failed: %s", task.task_id, e)
 
-        # Cleanup
-        task.result = result
-        del self._active_tasks[task.task_id]
-        self._completed_tasks.append(result)
+        self._finish_task(task, result)
 
         return result
 
@@ -294,19 +533,20 @@ class SubAgentSpawner:
         Returns:
             TaskResult (may be pending if async)
         """
-        task.status = TaskStatus.RUNNING
+        self._set_running(task)
+        started_ns = time.perf_counter_ns()
         started_at = datetime.now()
 
         # Submit to executor
-        future = self.executor.submit(task.handler, task.input_data)
+        future = self._pool_for(task).submit(task.handler, task.input_data)
         task.future = future
 
         try:
             # Wait for result with timeout
             result_data = future.result(timeout=timeout)
 
-            completed_at = datetime.now()
-            duration_ms = (completed_at - started_at).total_seconds() * 1000
+            duration_ms = (time.perf_counter_ns() - started_ns) / 1e6
+            completed_at = started_at + timedelta(milliseconds=duration_ms)
 
             result = TaskResult(
                 task_id=task.task_id,
@@ -324,7 +564,7 @@ class SubAgentSpawner:
                 error=f"Task timed out after {timeout}s",
                 started_at=started_at
             )
-            logger.warning(f"[SubAgent] Task {task.task_id} timed out")
+            logger.warning("[SubAgent] Task %s timed out", task.task_id)
 
         except Exception as e:
             result = TaskResult(
@@ -333,30 +573,104 @@ class SubAgentSpawner:
                 error=str(e),
                 started_at=started_at
             )
-            logger.error(f"[SubAgent] Task {task.task_id} failed: {e}")
+            logger.error("[SubAgent] Task %s failed: %s", task.task_id, e)
 
-        # Cleanup
-        task.result = result
-        del self._active_tasks[task.task_id]
-        self._completed_tasks.append(result)
+        self._finish_task(task, result)
 
         return result
 
+    def spawn_tasks_from_plan(
+        self,
+        tasks: List[TaskStep],
+        input_data: Optional[Dict[int, Dict[str, Any]]] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[int, TaskResult]:
+        """Run a write_todos plan stage by stage, in parallel within a stage.
+
+        Each step is spawned with the handler registered for its agent.
+        All steps in a stage (see plan_stages) are submitted to the executor
+        together, and the next stage starts once they finish. Step statuses
+        in the plan are updated as they run. Steps whose dependencies did
+        not complete are marked FAILED without being spawned.
+
+        Args:
+            tasks: Plan steps from write_todos
+            input_data: Optional input data per step number
+            timeout: Optional per-stage timeout override
+
+        Returns:
+            Dictionary of step number -> TaskResult for every spawned step
+        """
+        input_data = input_data or {}
+        timeout = timeout or self.timeout_seconds
+        step_to_index = {t.step: i for i, t in enumerate(tasks)}
+        results: Dict[int, TaskResult] = {}
+
+        for stage in plan_stages(tasks):
+            futures: Dict[int, Future] = {}
+            for step in stage:
+                blocked = [
+                    dep for dep in step.dependencies or ()
+                    if tasks[step_to_index[dep]].status != PlanStatus.COMPLETED
+                ]
+                if blocked:
+                    logger.warning(
+                        "[SubAgent] Skipping step %s: dependencies %s not completed", step.step, blocked
+                    )
+                    update_task_status(tasks, step.step, PlanStatus.FAILED, step_to_index)
+                    continue
+
+                update_task_status(tasks, step.step, PlanStatus.IN_PROGRESS, step_to_index)
+                futures[step.step] = self.executor.submit(
+                    self.spawn_task,
+                    step.agent or "",
+                    step.action,
+                    input_data.get(step.step, {})
+                )
+
+            wait(futures.values(), timeout=timeout)
+            for step_number, future in futures.items():
+                if future.done():
+                    result = future.result()
+                else:
+                    result = TaskResult(
+                        task_id=f"step-{step_number}",
+                        status=TaskStatus.TIMEOUT,
+                        error=f"Step timed out after {timeout}s"
+                    )
+                results[step_number] = result
+                update_task_status(
+                    tasks, step_number,
+                    PlanStatus.COMPLETED if result.status == TaskStatus.COMPLETED else PlanStatus.FAILED,
+                    step_to_index
+                )
+
+        return results
+
     def get_active_tasks(self) -> List[Dict[str, Any]]:
         """Get list of active tasks.
 
+        The summaries are rebuilt only when the set of active tasks or
+        their status has changed since the last call; otherwise the same
+        summary dicts are returned in a new list. Treat them as read-only.
+
         Returns:
             List of active task summaries
         """
-        return [
-            {
-                "task_id": t.task_id,
-                "agent_type": t.agent_type.value,
-                "description": t.description,
-                "status": t.status.value
-            }
-            for t in self._active_tasks.values()
-        ]
+        with self._lock:
+            if self._active_snapshot_version == self._active_version:
+                return list(self._active_snapshot)
+            self._active_snapshot = [
+                {
+                    "task_id": t.task_id,
+                    "agent_type": t.agent_type.value,
+                    "description": t.description,
+                    "status": t.status.value
+                }
+                for t in self._active_tasks.values()
+            ]
+            self._active_snapshot_version = self._active_version
+            return list(self._active_snapshot)
 
     def get_completed_tasks(self, limit: int = 20) -> List[TaskResult]:
         """Get recent completed tasks.
@@ -367,7 +681,12 @@ class SubAgentSpawner:
         Returns:
             List of TaskResult objects
         """
-        return self._completed_tasks[-limit:]
+        with self._lock:
+            completed = self._completed_tasks
+            if 0 < limit < len(completed):
+                # Index from the tail; deque access near either end is O(1)
+                return [completed[-i] for i in range(limit, 0, -1)]
+            return list(completed)[-limit:]
 
     def cancel_task(self, task_id: str) -> bool:
         """Cancel an active task.
@@ -378,23 +697,26 @@ class SubAgentSpawner:
         Returns:
             True if cancelled, False if not found
         """
-        task = self._active_tasks.get(task_id)
-        if not task:
-            return False
+        with self._lock:
+            task = self._active_tasks.pop(task_id, None)
+            if not task:
+                return False
+            task.status = TaskStatus.CANCELLED
+            self._active_version += 1
 
         if task.future:
             task.future.cancel()
 
-        task.status = TaskStatus.CANCELLED
-        del self._active_tasks[task_id]
-
-        logger.info(f"[SubAgent] Task {task_id} cancelled")
+        logger.info("[SubAgent] Task %s cancelled", task_id)
         return True
 
     def shutdown(self) -> None:
         """Shutdown the spawner and executor."""
         logger.info("Shutting down SubAgentSpawner")
         self.executor.shutdown(wait=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
 
 
 # Global spawner instance
@@ -9,13 +9,18 @@ This module provides an interactive command-line interface with:
 """
 
 import logging
+import sys
 from typing import List, Dict, Optional, Any, Tuple
+from pydantic import BaseModel
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.table import Table
 from rich.prompt import Prompt, Confirm
 
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:  # Optional persistent line editor for the chat prompt
+    PromptSession = None
+
 from agent.base.hitl_manager import (
     HITLManager,
     HITLRequest,
@@ -32,6 +37,50 @@ from agent.base.audit_logger import AuditLogger, get_audit_logger
 
 logger = logging.getLogger(__name__)
 
+# Most recent messages passed to the orchestrator on each turn
+HISTORY_WINDOW = 20
+
+# Gate #5 answers (menu number or action name) mapped to the chosen action
+_EXCEPTION_ACTIONS = {
+    "1": "retry",
+    "2": "skip",
+    "3": "abort",
+    "retry": "retry",
+    "skip": "skip",
+    "abort": "abort",
+}
+_EXCEPTION_CHOICES = list(_EXCEPTION_ACTIONS)
+
+WELCOME_TEXT = """
+# Welcome to the Intelligent PO Assistant!
+
+I can help you monitor inventory and manage purchase orders.
+
+**Available commands:**
+- `check inventory` - Check current inventory levels
+- `history` - View conversation history
+- `sessions` - Manage conversation sessions
+- `help` - Show this help message
+- `quit` or `exit` - Exit the application
+
+**HITL Gates:**
+- Gate 1: PO Creation Approval
+- Gate 2: Supplier Selection
+- Gate 3: High-Value PO Approval (>$10,000)
+- Gate 4: Threshold Adjustment
+- Gate 5: Exception Handling
+
+Type your message below to get started!
+"""
+
+
+def _supplier_label(supplier: Dict[str, Any], recommended_id: Optional[str]) -> str:
+    """Supplier name for the selection table, tagged when it is the recommendation."""
+    name = supplier.get("supplier_name", "Unknown")
+    if supplier.get("supplier_id") == recommended_id:
+        return name + " [bold](Recommended)[/bold]"
+    return name
+
 
 class ChatInterface:
     """Enhanced CLI chat interface with HITL support and persistence."""
@@ -50,13 +99,49 @@ class ChatInterface:
         self.conversation_store = get_conversation_store()
         self.audit = audit_logger or get_audit_logger()
 
+        # Reusable line editor for interactive terminals; piped input falls back to input()
+        self._session = PromptSession() if (
+            PromptSession is not None and sys.stdin.isatty() and sys.stdout.isatty()
+        ) else None
+
+        # Gate #3 threshold, resolved once rather than per purchase order
+        self._high_value_threshold = self.hitl_manager.gate_configs[HITLGateType.HIGH_VALUE_APPROVAL]['threshold']
+
+        # Built-in commands keyed by lowercased input
+        self._commands = {
+            "quit": self._cmd_exit,
+            "exit": self._cmd_exit,
+            "bye": self._cmd_exit,
+            "help": self._cmd_help,
+            "?": self._cmd_help,
+            "history": self._cmd_history,
+            "sessions": self._cmd_sessions,
+        }
+        self._max_command_len = max(map(len, self._commands))
+
+        # Session menu actions keyed by their first word
+        self._session_actions = {
+            "load": self._load_session_action,
+            "delete": self._delete_session_action,
+            "clear": self._clear_sessions_action,
+        }
+
+        # Welcome panel, rendered from WELCOME_TEXT on first display
+        self._welcome_panel: Optional[Panel] = None
+
+        # Per-session caches of the store's workflow state and history,
+        # primed by _initialize_session and dropped whenever the active
+        # session changes
+        self._state_cache: Optional[Dict[str, Any]] = None
+        self._history_cache: Optional[List[Dict[str, str]]] = None
+
         # Initialize or load session
         self._initialize_session()
 
     def _initialize_session(self):
         """Initialize or resume a conversation session."""
         # Try to load latest session or create new one
-        existing_sessions = self.conversation_store.list_sessions()
+        existing_sessions = self.conversation_store.list_sessions(limit=1)
 
         if existing_sessions:
             # Ask user if they want to resume
@@ -73,6 +158,7 @@ class ChatInterface:
                     if resume:
                         session = self.conversation_store.load_session(latest["session_id"])
                         if session:
+                            self._history_cache = self.conversation_store.get_conversation_history()
                             self.console.print("[green]Session resumed.[/green]\n")
                             return
                 except Exception:
@@ -81,15 +167,37 @@ class ChatInterface:
 
         # Create new session
         self.conversation_store.create_session(metadata={"source": "cli"})
+        self._history_cache = []
+
+    def _invalidate_caches(self):
+        """Drop cached state and history after the active session changes."""
+        self._state_cache = None
+        self._history_cache = None
 
     @property
     def conversation_history(self) -> List[Dict[str, str]]:
-        """Get conversation history from the store."""
-        return self.conversation_store.get_conversation_history()
+        """Get conversation history, loading it from the store once per session."""
+        if self._history_cache is None:
+            self._history_cache = self.conversation_store.get_conversation_history()
+        return self._history_cache
+
+    def _add_message(self, role: str, content: str):
+        """Add a message to the store and the cached history."""
+        self.conversation_store.add_message(role, content)
+        history = self._history_cache
+        if history is not None:
+            history.append({"role": role, "content": content})
+            # Mirror the store's per-session message cap
+            overflow = len(history) - self.conversation_store.max_messages_per_session
+            if overflow > 0:
+                del history[:overflow]
 
     @property
     def workflow_state(self) -> Dict[str, Any]:
-        """Get workflow state from the store."""
+        """Get workflow state, loading it from the store once per session."""
+        if self._state_cache is not None:
+            return self._state_cache
+
         state = self.conversation_store.get_workflow_state()
         if not state:
             state = {
@@ -101,43 +209,31 @@ class ChatInterface:
                 "pending_hitl_request": None,
             }
             self.conversation_store.update_workflow_state(state)
+        self._state_cache = state
         return state
 
+    def _set_workflow_state(self, state: Dict[str, Any]):
+        """Replace the cached workflow state and persist it in a single write."""
+        self._state_cache = state
+        self.conversation_store.update_workflow_state(state)
+
     def _update_workflow_state(self, updates: Dict[str, Any]):
-        """Update workflow state in the store."""
-        state = self.workflow_state.copy()
+        """Update the cached workflow state in place and write it through to the store."""
+        state = self.workflow_state
         state.update(updates)
-        self.conversation_store.update_workflow_state(state)
+        self._set_workflow_state(state)
 
     def show_welcome(self):
         """Display welcome message."""
-        welcome_text = """
-# Welcome to the Intelligent PO Assistant!
-
-I can help you monitor inventory and manage purchase orders.
-
-**Available commands:**
-- `check inventory` - Check current inventory levels
-- `history` - View conversation history
-- `sessions` - Manage conversation sessions
-- `help` - Show this help message
-- `quit` or `exit` - Exit the application
-
-**HITL Gates:**
-- Gate 1: PO Creation Approval
-- Gate 2: Supplier Selection
-- Gate 3: High-Value PO Approval (>$10,000)
-- Gate 4: Threshold Adjustment
-- Gate 5: Exception Handling
+        if self._welcome_panel is None:
+            from rich.markdown import Markdown
 
-Type your message below to get started!
-        """
-
-        self.console.print(Panel(
-            Markdown(welcome_text),
-            title="[bold blue]PO Assistant - Phase 1.6 Complete[/bold blue]",
-            border_style="blue"
-        ))
+            self._welcome_panel = Panel(
+                Markdown(WELCOME_TEXT),
+                title="[bold blue]PO Assistant - Phase 1.6 Complete[/bold blue]",
+                border_style="blue"
+            )
+        self.console.print(self._welcome_panel)
 
     def get_user_input(self) -> str:
         """
@@ -146,6 +242,10 @@ Type your message below to get started!
         Returns:
             User's input message
         """
+        if self._session is not None:
+            self.console.print()
+            return self._session.prompt([("bold ansicyan", "You:"), ("", " ")]).strip()
+
         self.console.print("\n[bold cyan]You:[/bold cyan] ", end="")
         return input().strip()
 
@@ -199,6 +299,8 @@ Type your message below to get started!
             recommended_supplier_id=recommended_id
         )
 
+        from rich.table import Table
+
         # Display as a table
         table = Table(title=f"Supplier Options for {product_name}")
         table.add_column("#", style="cyan")
@@ -207,19 +309,18 @@ Type your message below to get started!
         table.add_column("Lead Time", style="blue")
         table.add_column("Rating", style="magenta")
 
-        for i, supplier in enumerate(supplier_options, 1):
-            is_rec = supplier.get("supplier_id") == recommended_id
-            name = supplier.get("supplier_name", "Unknown")
-            if is_rec:
-                name += " [bold](Recommended)[/bold]"
-
-            table.add_row(
+        rows = [
+            (
                 str(i),
-                name,
+                _supplier_label(supplier, recommended_id),
                 f"${supplier.get('unit_price', 0):.2f}",
                 f"{supplier.get('lead_time_days', 0)} days",
-                f"{supplier.get('rating', 0):.1f}/5.0"
+                f"{supplier.get('rating', 0):.1f}/5.0",
             )
+            for i, supplier in enumerate(supplier_options, 1)
+        ]
+        for row in rows:
+            table.add_row(*row)
 
         self.console.print("\n")
         self.console.print(table)
@@ -227,14 +328,24 @@ Type your message below to get started!
 
         response = self.get_user_input()
 
+        # Index options once; the first supplier wins on duplicate IDs or names
+        by_id: Dict[Any, Dict[str, Any]] = {}
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for s in supplier_options:
+            by_id.setdefault(s.get("supplier_id"), s)
+            by_name.setdefault(s.get("supplier_name", "").lower(), s)
+        recommended = by_id.get(recommended_id)
+        fallback = recommended if recommended is not None else (
+            supplier_options[0] if supplier_options else None
+        )
+
         # Process response
-        if response.lower() in ["skip", "s", ""]:
+        lowered = response.lower()
+        if lowered in ("skip", "s", ""):
             # Use recommendation
-            for s in supplier_options:
-                if s.get("supplier_id") == recommended_id:
-                    logger.info(f"[HITL Gate #2] User accepted recommendation: {recommended_id}")
-                    return s
-            return supplier_options[0] if supplier_options else None
+            if recommended is not None:
+                logger.info(f"[HITL Gate #2] User accepted recommendation: {recommended_id}")
+            return fallback
 
         try:
             choice = int(response)
@@ -245,18 +356,21 @@ Type your message below to get started!
         except ValueError:
             pass
 
-        # Try matching by name or ID
-        for s in supplier_options:
-            if (response.lower() in s.get("supplier_name", "").lower() or
-                response.upper() == s.get("supplier_id", "")):
-                logger.info(f"[HITL Gate #2] User selected by name/ID: {s.get('supplier_id')}")
-                return s
+        # Try matching by exact ID or name, then by partial name
+        selected = by_id.get(response.upper())
+        if selected is None:
+            selected = by_name.get(lowered)
+        if selected is None:
+            selected = next(
+                (s for s in supplier_options if lowered in s.get("supplier_name", "").lower()),
+                None
+            )
+        if selected is not None:
+            logger.info(f"[HITL Gate #2] User selected by name/ID: {selected.get('supplier_id')}")
+            return selected
 
         logger.warning(f"[HITL Gate #2] Invalid selection, using recommendation")
-        for s in supplier_options:
-            if s.get("supplier_id") == recommended_id:
-                return s
-        return supplier_options[0] if supplier_options else None
+        return fallback
 
     def handle_high_value_approval(
         self,
@@ -290,8 +404,9 @@ Type your message below to get started!
         self.console.print(f"\nPO Number: {po_number}")
         self.console.print(f"Supplier: {supplier_name}")
         self.console.print(f"[bold]Total: ${total_amount:,.2f}[/bold]")
-        threshold = self.hitl_manager.gate_configs[HITLGateType.HIGH_VALUE_APPROVAL]['threshold']
-        self.console.print(f"\nThis exceeds the ${threshold:,.2f} threshold.")
+        self.console.print(f"\nThis exceeds the ${self._high_value_threshold:,.2f} threshold.")
+
+        from rich.table import Table
 
         # Show line items
         table = Table(title="Line Items")
@@ -300,13 +415,17 @@ Type your message below to get started!
         table.add_column("Price")
         table.add_column("Total")
 
-        for item in line_items:
-            table.add_row(
+        rows = [
+            (
                 item.get("product_name", "Unknown"),
                 str(item.get("quantity", 0)),
                 f"${item.get('unit_price', 0):.2f}",
-                f"${item.get('line_total', 0):.2f}"
+                f"${item.get('line_total', 0):.2f}",
             )
+            for item in line_items
+        ]
+        for row in rows:
+            table.add_row(*row)
 
         self.console.print(table)
 
@@ -326,6 +445,57 @@ Type your message below to get started!
         logger.info(f"[HITL Gate #3] High-value PO {po_number}: {'APPROVED' if approved else 'REJECTED'}")
         return (approved, reason if reason else None)
 
+    def review_high_value_orders(self, pending_approvals: List[Dict[str, Any]]) -> str:
+        """
+        Run HITL Gate #3 for a batch of high-value purchase orders.
+
+        All pending orders are surfaced together in one summary table, then
+        approved or rejected one at a time.
+
+        Args:
+            pending_approvals: Purchase orders above the high-value threshold
+
+        Returns:
+            Rejection notes to append to the agent response (empty if all approved)
+        """
+        for po in pending_approvals:
+            self.audit.log_hitl_gate("HIGH_VALUE_APPROVAL", "triggered", f"PO: {po.get('po_number')}, Total: ${po.get('total_amount', 0):.2f}")
+
+        if len(pending_approvals) > 1:
+            from rich.table import Table
+
+            table = Table(title=f"{len(pending_approvals)} Purchase Orders Awaiting Approval")
+            table.add_column("#", style="cyan")
+            table.add_column("PO Number")
+            table.add_column("Supplier", style="green")
+            table.add_column("Total", style="yellow")
+            rows = [
+                (
+                    str(i),
+                    po.get("po_number", ""),
+                    po.get("supplier_name", ""),
+                    f"${po.get('total_amount', 0):,.2f}",
+                )
+                for i, po in enumerate(pending_approvals, 1)
+            ]
+            for row in rows:
+                table.add_row(*row)
+            self.console.print("\n")
+            self.console.print(table)
+
+        notes = []
+        for po in pending_approvals:
+            approved, reason = self.handle_high_value_approval(
+                po_number=po.get("po_number", ""),
+                total_amount=po.get("total_amount", 0),
+                supplier_name=po.get("supplier_name", ""),
+                line_items=po.get("line_items", [])
+            )
+            self.audit.log_hitl_gate("HIGH_VALUE_APPROVAL", "APPROVED" if approved else "REJECTED", reason or "")
+            if not approved:
+                notes.append(f"\n\n[PO {po.get('po_number')} was rejected: {reason}]")
+        return "".join(notes)
+
     def handle_threshold_adjustment(
         self,
         product_id: str,
@@ -415,12 +585,11 @@ Type your message below to get started!
         self.console.print("  3. [bold]abort[/bold] - Abort the entire workflow")
 
         try:
-            choice = Prompt.ask("Select action", choices=["1", "2", "3", "retry", "skip", "abort"], default="skip")
+            choice = Prompt.ask("Select action", choices=_EXCEPTION_CHOICES, default="skip")
         except Exception:
             choice = "skip"
 
-        action_map = {"1": "retry", "2": "skip", "3": "abort"}
-        action = action_map.get(choice, choice)
+        action = _EXCEPTION_ACTIONS[choice]
 
         logger.info(f"[HITL Gate #5] User chose: {action}")
         return action
@@ -439,17 +608,19 @@ Type your message below to get started!
         for msg in history[-20:]:  # Show last 20 messages
             role = msg.get("role", "unknown")
             content = msg.get("content", "")
+            if len(content) > 100:
+                content = content[:100] + "..."
 
             if role == "user":
-                self.console.print(f"[cyan]You:[/cyan] {content[:100]}...")
+                self.console.print(f"[cyan]You:[/cyan] {content}")
             else:
-                self.console.print(f"[green]Agent:[/green] {content[:100]}...")
+                self.console.print(f"[green]Agent:[/green] {content}")
 
         self.console.print("-" * 40)
 
     def manage_sessions(self):
         """Session management interface."""
-        sessions = self.conversation_store.list_sessions()
+        sessions = self.conversation_store.list_sessions(limit=10)
 
         if not sessions:
             self.console.print("[dim]No saved sessions.[/dim]")
@@ -457,13 +628,15 @@ Type your message below to get started!
 
         self.console.print("\n[bold]Saved Sessions:[/bold]")
 
+        from rich.table import Table
+
         table = Table()
         table.add_column("#")
         table.add_column("Session ID")
         table.add_column("Created")
         table.add_column("Messages")
 
-        for i, session in enumerate(sessions[:10], 1):
+        for i, session in enumerate(sessions, 1):
             table.add_row(
                 str(i),
                 session.get("session_id", "")[:8],
@@ -480,34 +653,80 @@ Type your message below to get started!
         except Exception:
             return
 
-        if action.startswith("load "):
-            try:
-                idx = int(action.split()[1]) - 1
-                if 0 <= idx < len(sessions):
-                    session = self.conversation_store.load_session(sessions[idx]["session_id"])
-                    if session:
-                        self.console.print("[green]Session loaded.[/green]")
-            except (ValueError, IndexError):
-                self.console.print("[red]Invalid selection.[/red]")
-
-        elif action.startswith("delete "):
-            try:
-                idx = int(action.split()[1]) - 1
-                if 0 <= idx < len(sessions):
-                    if Confirm.ask("Are you sure?", default=False):
-                        self.conversation_store.delete_session(sessions[idx]["session_id"])
-                        self.console.print("[yellow]Session deleted.[/yellow]")
-            except (ValueError, IndexError):
-                self.console.print("[red]Invalid selection.[/red]")
-
-        elif action == "clear all":
-            try:
-                if Confirm.ask("Delete ALL sessions?", default=False):
-                    self.conversation_store.clear_all_sessions()
-                    self.conversation_store.create_session()
-                    self.console.print("[yellow]All sessions cleared.[/yellow]")
-            except Exception:
-                pass
+        parts = action.split(maxsplit=1)
+        if not parts:
+            return
+        handler = self._session_actions.get(parts[0])
+        if handler is not None:
+            handler(parts[1] if len(parts) > 1 else "", sessions)
+
+    @staticmethod
+    def _session_index(arg: str, sessions: List[Dict[str, Any]]) -> Optional[int]:
+        """Parse a 1-based session number, returning a list index or None if out of range."""
+        idx = int(arg.split()[0]) - 1
+        return idx if 0 <= idx < len(sessions) else None
+
+    def _load_session_action(self, arg: str, sessions: List[Dict[str, Any]]):
+        """Handle ``load <#>`` from the session menu."""
+        try:
+            idx = self._session_index(arg, sessions)
+            if idx is not None:
+                session = self.conversation_store.load_session(sessions[idx]["session_id"])
+                if session:
+                    self._invalidate_caches()
+                    self.console.print("[green]Session loaded.[/green]")
+        except (ValueError, IndexError):
+            self.console.print("[red]Invalid selection.[/red]")
+
+    def _delete_session_action(self, arg: str, sessions: List[Dict[str, Any]]):
+        """Handle ``delete <#>`` from the session menu."""
+        try:
+            idx = self._session_index(arg, sessions)
+            if idx is not None:
+                if Confirm.ask("Are you sure?", default=False):
+                    self.conversation_store.delete_session(sessions[idx]["session_id"])
+                    self._invalidate_caches()
+                    self.console.print("[yellow]Session deleted.[/yellow]")
+        except (ValueError, IndexError):
+            self.console.print("[red]Invalid selection.[/red]")
+
+    def _clear_sessions_action(self, arg: str, sessions: List[Dict[str, Any]]):
+        """Handle ``clear all`` from the session menu."""
+        if arg != "all":
+            return
+        try:
+            if Confirm.ask("Delete ALL sessions?", default=False):
+                self.conversation_store.clear_all_sessions()
+                self.conversation_store.create_session()
+                self._invalidate_caches()
+                self.console.print("[yellow]All sessions cleared.[/yellow]")
+        except Exception:
+            pass
+
+    def _cmd_exit(self, user_message: str) -> bool:
+        """Save the session and end the chat."""
+        self.conversation_store.save_session()
+        self.audit.log_action("SYSTEM", "Session ended by user")
+        self.console.print("\n[bold yellow]Session saved. Goodbye![/bold yellow]\n")
+        return False
+
+    def _cmd_help(self, user_message: str) -> bool:
+        """Show the welcome/help panel."""
+        self.audit.log_action("CHAT", "Help displayed")
+        self.show_welcome()
+        return True
+
+    def _cmd_history(self, user_message: str) -> bool:
+        """Show recent conversation history."""
+        self.audit.log_action("CHAT", "History displayed")
+        self.show_history()
+        return True
+
+    def _cmd_sessions(self, user_message: str) -> bool:
+        """Open the session management menu."""
+        self.audit.log_action("CHAT", "Session management opened")
+        self.manage_sessions()
+        return True
 
     def handle_user_message(self, user_message: str) -> bool:
         """
@@ -522,50 +741,33 @@ Type your message below to get started!
         # Log user input
         self.audit.log_user_input(user_message)
 
-        # Check for exit commands
-        if user_message.lower() in ["quit", "exit", "bye"]:
-            self.conversation_store.save_session()
-            self.audit.log_action("SYSTEM", "Session ended by user")
-            self.console.print("\n[bold yellow]Session saved. Goodbye![/bold yellow]\n")
-            return False
-
-        # Check for help command
-        if user_message.lower() in ["help", "?"]:
-            self.audit.log_action("CHAT", "Help displayed")
-            self.show_welcome()
-            return True
-
-        # Check for history command
-        if user_message.lower() == "history":
-            self.audit.log_action("CHAT", "History displayed")
-            self.show_history()
-            return True
-
-        # Check for sessions command
-        if user_message.lower() == "sessions":
-            self.audit.log_action("CHAT", "Session management opened")
-            self.manage_sessions()
-            return True
+        # Dispatch built-in commands; longer messages cannot be commands,
+        # so they skip lowercasing entirely
+        if len(user_message) <= self._max_command_len:
+            handler = self._commands.get(user_message.lower())
+            if handler is not None:
+                return handler(user_message)
 
         # Add user message to conversation store
-        self.conversation_store.add_message("user", user_message)
+        self._add_message("user", user_message)
 
         try:
             # Get current workflow state
-            state = self.workflow_state.copy()
-            old_stage = state.get('workflow_stage', 'initial')
-            logger.info(f"[ChatInterface] Loaded state: stage={old_stage}, recs={len(state.get('reorder_recommendations', []))}")
+            persisted = self.workflow_state
+            old_stage = persisted.get('workflow_stage', 'initial')
+            logger.info(f"[ChatInterface] Loaded state: stage={old_stage}, recs={len(persisted.get('reorder_recommendations', []))}")
             self.audit.log_action("ORCHESTRATOR", "State loaded", f"Stage: {old_stage}")
 
             # Create orchestrator state
-            state.update({
+            state = {
+                **persisted,
                 "user_message": user_message,
-                "conversation_history": self.conversation_history,
+                "conversation_history": self.conversation_history[-HISTORY_WINDOW:],
                 "inventory_summary": "",
                 "supplier_summary": "",
                 "po_summary": "",
                 "agent_response": ""
-            })
+            }
 
             # Run orchestrator workflow
             self.audit.log_action("ORCHESTRATOR", "Workflow invoked", f"Input: '{user_message[:50]}...'")
@@ -573,14 +775,12 @@ Type your message below to get started!
 
             # Update workflow state - serialize Pydantic objects to dicts for JSON storage
             reorder_recs = result.get("reorder_recommendations", [])
-            serialized_recs = []
-            for rec in reorder_recs:
-                if hasattr(rec, 'model_dump'):
-                    serialized_recs.append(rec.model_dump())
-                elif isinstance(rec, dict):
-                    serialized_recs.append(rec)
-                else:
-                    serialized_recs.append({})
+            serialized_recs = [
+                rec.model_dump() if isinstance(rec, BaseModel)
+                else rec if isinstance(rec, dict)
+                else {}
+                for rec in reorder_recs
+            ]
 
             new_stage = result.get("workflow_stage", "initial")
             logger.info(f"[ChatInterface] Workflow result: stage={new_stage}, recs={len(serialized_recs)}")
@@ -589,7 +789,8 @@ Type your message below to get started!
             if old_stage != new_stage:
                 self.audit.log_workflow_transition(old_stage, new_stage, user_message[:30])
 
-            self._update_workflow_state({
+            self._set_workflow_state({
+                **persisted,
                 "workflow_stage": new_stage,
                 "pending_action": result.get("pending_action", "none"),
                 "reorder_recommendations": serialized_recs,
@@ -603,27 +804,20 @@ Type your message below to get started!
             agent_response = result.get("agent_response", "Sorry, I couldn't process that request.")
 
             # Check for high-value POs requiring approval (Gate #3)
-            pos = result.get("purchase_orders", [])
-            for po in pos:
-                total = po.get("total_amount", 0)
-                if self.hitl_manager.check_high_value_threshold(total):
-                    self.audit.log_hitl_gate("HIGH_VALUE_APPROVAL", "triggered", f"PO: {po.get('po_number')}, Total: ${total:.2f}")
-                    approved, reason = self.handle_high_value_approval(
-                        po_number=po.get("po_number", ""),
-                        total_amount=total,
-                        supplier_name=po.get("supplier_name", ""),
-                        line_items=po.get("line_items", [])
-                    )
-                    self.audit.log_hitl_gate("HIGH_VALUE_APPROVAL", "APPROVED" if approved else "REJECTED", reason or "")
-                    if not approved:
-                        agent_response += f"\n\n[PO {po.get('po_number')} was rejected: {reason}]"
+            threshold = self._high_value_threshold
+            pending_approvals = [
+                po for po in result.get("purchase_orders", [])
+                if po.get("total_amount", 0) > threshold
+            ]
+            if pending_approvals:
+                agent_response += self.review_high_value_orders(pending_approvals)
 
             # Show response
             self.show_agent_response(agent_response)
             self.audit.log_agent_response("ORCHESTRATOR", agent_response)
 
             # Add to conversation store
-            self.conversation_store.add_message("assistant", agent_response)
+            self._add_message("assistant", agent_response)
 
         except Exception as e:
             logger.error(f"Error processing message: {e}", exc_info=True)